@@ -0,0 +1,205 @@
+"""Server aiohttp local care imită API-ul ANM, pentru teste de încărcare.
+
+Servește aceleași căi ca meteoromania.ro (`/avertizari-xml.php` și
+`/wp-json/meteoapi/v2/<endpoint>`) din payload-urile înregistrate
+(`avertizari-xml.xml` și `tests/fixtures/`). Parametrii reglabili sunt:
+
+- latența (`--latency`, `--latency-jitter`, în ms);
+- rata erorilor HTTP 503 (`--error-rate`) și a răspunsurilor blocate, care
+  depășesc timeout-ul clientului (`--stall-rate`);
+- mărimea payload-urilor (`--scale`: avertizările XML, stațiile, orașele
+  și avertizările nowcasting sunt multiplicate);
+- frecvența schimbărilor (`--change-every`, secunde): la fiecare versiune
+  nouă se schimbă culoarea unui județ, o temperatură, un mesaj nowcasting.
+
+Răspunsurile au ETag / Last-Modified și respectă cererile condiționale
+(304). `GET /_stats` întoarce numărul de cereri și octeții trimiși.
+
+Rulare (din rădăcina repository-ului):
+
+    python benchmarks/anm_mock_server.py --port 8765 --latency 150 --error-rate 0.02 --change-every 300
+
+apoi, în opțiunile integrării, `base_url` = `http://127.0.0.1:8765/`.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from collections import Counter
+from email.utils import formatdate
+import xml.etree.ElementTree as ET
+
+from aiohttp import hdrs, web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+API_PATH = "/wp-json/meteoapi/v2/"
+
+# endpoint -> (fișier, calea listei multiplicate de --scale)
+JSON_ENDPOINTS = {
+    "avertizari-generale": ("avertizari-generale.json", ("avertizare",)),
+    "avertizari-nowcasting": ("avertizari-nowcasting.json", ("avertizare",)),
+    "starea-vremii": ("starea-vremii.json", ("features",)),
+    "prognoza-orase": ("prognoza-orase.json", ("tara", "localitate")),
+}
+
+
+def _container(data, path):
+    for key in path[:-1]:
+        data = data[key]
+    return data
+
+
+def _scaled_list(data, path, scale):
+    container = _container(data, path)
+    items = container[path[-1]]
+    if isinstance(items, dict):
+        items = [items]
+    scaled = []
+    for i in range(scale):
+        for item in items:
+            item = copy.deepcopy(item)
+            if i:
+                attrs = item.get("properties") or item.get("@attributes") or {}
+                for key in ("nume", "zona"):
+                    if key in attrs:
+                        attrs[key] = f"{attrs[key]} {i}"
+            scaled.append(item)
+    container[path[-1]] = scaled
+    return scaled
+
+
+class Payloads:
+    """Payload-urile fiecărui endpoint, regenerate la fiecare versiune."""
+
+    def __init__(self, xml_path, scale, change_every):
+        self._change_every = change_every
+        self._started = time.time()
+        self._cache = {}
+        self._xml = ET.parse(xml_path).getroot()
+        avertizari = list(self._xml)
+        for _ in range(scale - 1):
+            self._xml.extend(copy.deepcopy(avertizare) for avertizare in avertizari)
+        self._json = {}
+        for endpoint, (name, path) in JSON_ENDPOINTS.items():
+            with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+                data = json.load(file)
+            _scaled_list(data, path, scale)
+            self._json[endpoint] = data
+
+    def version(self):
+        if not self._change_every:
+            return 0
+        return int((time.time() - self._started) // self._change_every)
+
+    def last_modified(self, version):
+        return formatdate(self._started + version * (self._change_every or 0), usegmt=True)
+
+    def get(self, endpoint, version):
+        key = (endpoint, version)
+        if key not in self._cache:
+            self._cache = {k: v for k, v in self._cache.items() if k[1] == version}
+            self._cache[key] = self._render(endpoint, version)
+        return self._cache[key]
+
+    def _render(self, endpoint, version):
+        if endpoint == "avertizari-xml.php":
+            root = copy.deepcopy(self._xml)
+            judet = root.find("avertizare/judet")
+            if judet is not None and version:
+                judet.set("culoare", str(version % 4))
+            return ET.tostring(root, encoding="utf-8", xml_declaration=True), "application/xml"
+
+        data = copy.deepcopy(self._json[endpoint])
+        if version:
+            _, path = JSON_ENDPOINTS[endpoint]
+            first = _container(data, path)[path[-1]][0]
+            attrs = first.get("properties") or first.get("@attributes") or {}
+            if endpoint == "starea-vremii":
+                attrs["tempe"] = f"{20 + version % 10}.0"
+            elif endpoint == "prognoza-orase":
+                prognoza = first.get("prognoza")
+                if isinstance(prognoza, list) and prognoza:
+                    prognoza[0]["temp_max"] = str(25 + version % 10)
+            elif endpoint == "avertizari-nowcasting":
+                attrs["semnalare"] = f"{attrs.get('semnalare')} (v{version})"
+            else:
+                judete = first.get("judet")
+                judet = judete[0] if isinstance(judete, list) else judete
+                judet["@attributes"]["culoare"] = str(version % 4)
+        return json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json"
+
+
+def create_app(args):
+    payloads = Payloads(args.xml, args.scale, args.change_every)
+    stats = Counter()
+
+    async def _serve(request, endpoint):
+        stats["requests"] += 1
+        stats[f"requests:{endpoint}"] += 1
+        delay = max(0.0, args.latency + random.uniform(-args.latency_jitter, args.latency_jitter)) / 1000
+        if random.random() < args.stall_rate:
+            stats["stalled"] += 1
+            delay = args.stall_seconds
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < args.error_rate:
+            stats["errors"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        version = payloads.version()
+        etag = f'"{endpoint}-{version}"'
+        last_modified = payloads.last_modified(version)
+        headers = {hdrs.ETAG: etag, hdrs.LAST_MODIFIED: last_modified}
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            stats["not_modified"] += 1
+            return web.Response(status=304, headers=headers)
+        body, content_type = payloads.get(endpoint, version)
+        stats["ok"] += 1
+        stats["bytes"] += len(body)
+        return web.Response(body=body, content_type=content_type, charset="utf-8", headers=headers)
+
+    async def handle_xml(request):
+        return await _serve(request, "avertizari-xml.php")
+
+    async def handle_api(request):
+        endpoint = request.match_info["endpoint"]
+        if endpoint not in JSON_ENDPOINTS:
+            raise web.HTTPNotFound()
+        return await _serve(request, endpoint)
+
+    async def handle_stats(request):
+        return web.json_response({**stats, "version": payloads.version()})
+
+    app = web.Application()
+    app.router.add_get("/avertizari-xml.php", handle_xml)
+    app.router.add_get(API_PATH + "{endpoint}", handle_api)
+    app.router.add_get("/_stats", handle_stats)
+    return app
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--xml", default=os.path.join(ROOT, "avertizari-xml.xml"))
+    parser.add_argument("--latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracțiune de răspunsuri 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fracțiune de răspunsuri blocate")
+    parser.add_argument("--stall-seconds", type=float, default=10.0)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--change-every", type=float, default=0.0, help="secunde; 0 = payload fix")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    web.run_app(create_app(args), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Micro-benchmark: potrivirea județ -> zone în avertizările XML.
+
+Compară algoritmul din sensor.py-ul inițial (direct pe elementele
+ElementTree: pentru fiecare <judet> se scanează toate <zona> cu
+`startswith(f"{cod}_")`, `clean_html` fără cache, iar intrările se construiesc
+pentru toate județele și abia apoi se filtrează) cu modelul și indexul
+construit o dată per <avertizare> în `parsing.build_avertizari_xml`.
+Rândurile `+ XML` includ și parsarea documentului.
+
+Rulare (din rădăcina repository-ului):
+
+    python benchmarks/bench_avertizari_xml.py [--zone-per-judet 6] [--judet CJ]
+
+Fișierul `avertizari-xml.xml` nu are elemente <zona>; pentru a măsura
+cazul cu multe zone (ex. zonele montane) adăugăm, în memorie, `N` zone
+sintetice `COD_1..COD_N` pentru fiecare județ.
+"""
+import argparse
+import html
+import os
+import re
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from custom_components.meteo_anm.parsing import (  # noqa: E402
+    build_avertizari_xml,
+    parse_avertizari_xml,
+)
+
+
+def legacy_clean_html(value):
+    """`_clean_html` din sensor.py-ul inițial, fără cache."""
+    if not isinstance(value, str):
+        return value
+    text = html.unescape(value)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = " ".join(text.split())
+    text = re.sub(r"\bAT\s+EN([ȚȚŢT])", r"ATEN\1", text, flags=re.IGNORECASE)
+    return text
+
+
+def legacy_avertizari_xml(root, judet=None):
+    """Algoritmul din sensor.py-ul inițial, direct pe elementele ElementTree."""
+    avertizari = []
+    filtered = []
+    for avertizare in root.findall("avertizare"):
+        a_attrs = avertizare.attrib or {}
+        judete = avertizare.findall("judet") or []
+        zone = avertizare.findall("zona") or []
+        judete_entries = []
+        for element in judete:
+            j_attrs = element.attrib or {}
+            cod = (j_attrs.get("cod") or "").upper()
+            culoare = (j_attrs.get("culoare") or "").strip()
+            if not culoare or culoare == "0":
+                continue
+            zone_match = []
+            for z in zone:
+                z_attrs = z.attrib or {}
+                z_cod = (z_attrs.get("cod") or "").upper()
+                if z_cod and (z_cod.startswith(f"{cod}_") or z_cod == cod):
+                    zone_match.append({"cod": z_cod, "culoare": (z_attrs.get("culoare") or "").strip()})
+            judete_entries.append({
+                "judet": cod,
+                "culoare": culoare,
+                "fenomene_vizate": a_attrs.get("fenomeneVizate"),
+                "data_expirarii": a_attrs.get("dataExpirarii"),
+                "data_aparitiei": a_attrs.get("dataAparitiei"),
+                "intervalul": a_attrs.get("intervalul"),
+                "mesaj": legacy_clean_html(a_attrs.get("mesaj")),
+                "zona_afectata": legacy_clean_html(a_attrs.get("zonaAfectata")),
+                "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
+                "zone": zone_match or None,
+            })
+        alert_entry = {
+            "meta": {
+                "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
+                "data_aparitiei": a_attrs.get("dataAparitiei"),
+                "data_expirarii": a_attrs.get("dataExpirarii"),
+                "fenomene_vizate": a_attrs.get("fenomeneVizate"),
+                "mesaj": legacy_clean_html(a_attrs.get("mesaj")),
+                "culoare": a_attrs.get("culoare"),
+            },
+            "judete": judete_entries,
+        }
+        avertizari.append(alert_entry)
+        if judet:
+            judet_matches = [j for j in judete_entries if j.get("judet") == judet]
+            if judet_matches:
+                filtered.append({**alert_entry, "judete": judet_matches})
+    return filtered if judet else avertizari
+
+
+def load_document(path, zone_per_judet):
+    root = ET.parse(path).getroot()
+    for avertizare in root.findall("avertizare"):
+        for judet in avertizare.findall("judet"):
+            for i in range(1, zone_per_judet + 1):
+                ET.SubElement(avertizare, "zona", {"cod": f"{judet.get('cod')}_{i}", "culoare": judet.get("culoare", "0")})
+    return ET.tostring(root, encoding="unicode")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--xml", default=os.path.join(ROOT, "avertizari-xml.xml"))
+    parser.add_argument("--zone-per-judet", type=int, default=6)
+    parser.add_argument("--judet", default="CJ")
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    document = load_document(args.xml, args.zone_per_judet)
+    root = ET.fromstring(document)
+    model = parse_avertizari_xml(document)
+    zone = sum(len(a.zone) for a in model)
+    print(f"{len(model)} avertizari, {zone} zone, {args.number} iteratii")
+
+    cases = []
+    for judet in (None, args.judet):
+        label = judet or "toate judetele"
+        cases.append((label, lambda j=judet: legacy_avertizari_xml(root, j), lambda j=judet: build_avertizari_xml(model, j)))
+        cases.append((
+            f"{label} + XML",
+            lambda j=judet: legacy_avertizari_xml(ET.fromstring(document), j),
+            lambda j=judet: build_avertizari_xml(parse_avertizari_xml(document), j),
+        ))
+    for label, legacy, current in cases:
+        before = timeit.timeit(legacy, number=args.number)
+        after = timeit.timeit(current, number=args.number)
+        print(
+            f"{label:>22}: inainte {before / args.number * 1000:8.3f} ms"
+            f" | dupa {after / args.number * 1000:8.3f} ms"
+            f" | x{before / after:5.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
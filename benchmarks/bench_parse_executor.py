@@ -0,0 +1,74 @@
+"""Micro-benchmark: cât blochează parsarea avertizărilor event loop-ul.
+
+Compară parsarea documentului direct pe event loop (comportamentul vechi)
+cu parsarea în executor, cum face `ANMFeed` peste
+`EXECUTOR_PARSE_THRESHOLD`. În paralel rulează un task care se trezește la
+fiecare milisecundă și măsoară întârzierea maximă a loop-ului.
+
+Rulare (din rădăcina repository-ului):
+
+    python benchmarks/bench_parse_executor.py [--xml avertizari-xml.xml] [--number 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from custom_components.meteo_anm.parsing import (  # noqa: E402
+    parse_avertizari_xml,
+    prepare_avertizari_model,
+)
+
+
+def decode(body):
+    return prepare_avertizari_model(parse_avertizari_xml(body))
+
+
+async def measure(body, number, offload):
+    loop = asyncio.get_running_loop()
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(number):
+        if offload:
+            await loop.run_in_executor(None, decode, body)
+        else:
+            decode(body)
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick
+    return elapsed / number * 1000, max_lag * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--xml", default=os.path.join(ROOT, "avertizari-xml.xml"))
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.xml, "rb") as file:
+        body = file.read()
+    print(f"{len(body) / 1024:.0f} KiB, {args.number} iteratii")
+
+    for label, offload in (("event loop", False), ("executor", True)):
+        parse_ms, lag_ms = asyncio.run(measure(body, args.number, offload))
+        print(f"{label:>10}: parsare {parse_ms:8.3f} ms | blocare maxima loop {lag_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
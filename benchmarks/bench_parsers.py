@@ -0,0 +1,132 @@
+"""Benchmark: timp și memorie de vârf pentru fiecare parser, pe fixture-uri.
+
+Folosește documentul XML înregistrat (`avertizari-xml.xml`) și payload-urile
+din `tests/fixtures/`, deci rulează fără rețea. Pentru fiecare pas
+(parsare, index, construirea atributelor unui senzor) raportează timpul
+mediu și vârful de memorie alocată (tracemalloc) la un singur apel.
+
+Rulare (din rădăcina repository-ului):
+
+    python benchmarks/bench_parsers.py [--number 200] [--filter nowcasting]
+
+Fixture-urile JSON sunt mici; `--scale N` le multiplică elementele (stații,
+orașe, avertizări nowcasting) ca să apropie mărimea de payload-urile reale.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+sys.path.insert(0, ROOT)
+
+from custom_components.meteo_anm.delta import alert_items_xml  # noqa: E402
+from custom_components.meteo_anm.parsing import (  # noqa: E402
+    ANM_TIME_ZONE,
+    LocalityPattern,
+    build_avertizari_generale,
+    build_avertizari_harta,
+    build_avertizari_nowcasting,
+    build_avertizari_xml,
+    index_avertizari_generale,
+    index_avertizari_nowcasting,
+    index_prognoza_orase,
+    index_starea_vremii,
+    parse_avertizari_xml,
+)
+
+
+def _read(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _json(name, scale, path):
+    """Fixture-ul JSON cu lista de la `path` multiplicată de `scale` ori (nume distincte)."""
+    data = json.loads(_read(os.path.join(FIXTURES, name)))
+    container = data
+    for key in path[:-1]:
+        container = container[key]
+    items = container[path[-1]]
+    if isinstance(items, dict):
+        items = [items]
+    scaled = []
+    for i in range(scale):
+        for item in items:
+            item = copy.deepcopy(item)
+            if i:
+                attrs = item.get("properties") or item.get("@attributes")
+                for key in ("nume", "zona"):
+                    if key in attrs:
+                        attrs[key] = f"{attrs[key]} {i}"
+            scaled.append(item)
+    container[path[-1]] = scaled
+    return data
+
+
+def cases(scale):
+    recorded = _read(os.path.join(ROOT, "avertizari-xml.xml"))
+    zone = _read(os.path.join(FIXTURES, "avertizari-xml-zone.xml"))
+    model = parse_avertizari_xml(recorded)
+    now = datetime(2026, 1, 20, 12, 0, tzinfo=ANM_TIME_ZONE)
+
+    generale = _json("avertizari-generale.json", scale, ("avertizare",))
+    generale_index = index_avertizari_generale(generale)
+    nowcasting = _json("avertizari-nowcasting.json", scale, ("avertizare",))
+    nowcasting_index = index_avertizari_nowcasting(nowcasting)
+    starea = _json("starea-vremii.json", scale, ("features",))
+    starea_index = index_starea_vremii(starea)
+    prognoza = _json("prognoza-orase.json", scale, ("tara", "localitate"))
+    pattern = LocalityPattern("Constanta !dig")
+
+    return [
+        ("xml: parse (inregistrat)", lambda: parse_avertizari_xml(recorded)),
+        ("xml: parse (multe zone)", lambda: parse_avertizari_xml(zone)),
+        ("xml: atribute toate judetele", lambda: build_avertizari_xml(model, now=now)),
+        ("xml: atribute judet CJ", lambda: build_avertizari_xml(model, "CJ", now=now)),
+        ("xml: atribute compacte CJ", lambda: build_avertizari_xml(model, "CJ", compact=True, now=now)),
+        ("xml: atribute CJ + locatie (coordGis)", lambda: build_avertizari_xml(model, "CJ", now=now, punct=(44.43, 26.1))),
+        ("xml: harta", lambda: build_avertizari_harta(model, now=now)),
+        ("xml: alerte (delta)", lambda: alert_items_xml(model)),
+        ("generale: index", lambda: index_avertizari_generale(generale)),
+        ("generale: judet CJ", lambda: build_avertizari_generale(generale_index, "CJ")),
+        ("nowcasting: index", lambda: index_avertizari_nowcasting(nowcasting)),
+        ("nowcasting: judet Cluj", lambda: build_avertizari_nowcasting(nowcasting_index, "Cluj", now=now)),
+        ("starea-vremii: index", lambda: index_starea_vremii(starea)),
+        ("starea-vremii: cautare in index", lambda: starea_index.find(pattern)),
+        ("prognoza-orase: index", lambda: index_prognoza_orase(prognoza)),
+    ]
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--filter", default="")
+    args = parser.parse_args()
+
+    print(f"{'parser':<38} {'timp/apel':>12} {'memorie varf':>14}")
+    for label, func in cases(args.scale):
+        if args.filter not in label:
+            continue
+        elapsed = timeit.timeit(func, number=args.number) / args.number
+        peak = peak_memory(func)
+        print(f"{label:<38} {elapsed * 1000:9.3f} ms {peak / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
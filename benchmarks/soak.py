@@ -0,0 +1,242 @@
+"""Test de încărcare/anduranță: multe intrări ANM pe serverul local.
+
+Pornește `anm_mock_server.py` (sau folosește `--base-url`), creează o
+instanță Home Assistant minimală și `--entries` intrări simulate: fiecare
+are feed-urile comune (`async_get_feed`) și senzorii `ANMSensors` ai unei
+intrări reale, cu județ și localitate diferite. Senzorii nu sunt adăugați
+în state machine; se măsoară descărcarea, parsarea, indexarea și filtrarea
+per intrare, adică tot ce face integrarea până la scrierea stării.
+
+La fiecare `--report` secunde afișează: verificări/s, procentul reușit,
+întârzierea event loop-ului (max și p99), RSS și ultima durată de parsare.
+Cu un `--interval` mic (implicit 5 s în loc de 180 s), câteva minute de
+rulare simulează ore de interogare.
+
+Rulare (din rădăcina repository-ului, cu Home Assistant instalat):
+
+    python benchmarks/soak.py --entries 200 --duration 1800 -- --latency 150 --error-rate 0.02 --change-every 60
+
+Argumentele de după `--` sunt trimise serverului (vezi anm_mock_server.py).
+"""
+import argparse
+import asyncio
+from collections import Counter
+from datetime import timedelta
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.meteo_anm import async_get_feed  # noqa: E402
+from custom_components.meteo_anm.sensor import SENSOR_DEFINITIONS, ANMSensors, endpoint_url  # noqa: E402
+from custom_components.meteo_anm.static_config import JUDETE  # noqa: E402
+
+LOCALITATI = ["Bucuresti !Filaret", "Constanta !dig", "Cluj", "Iasi", "Sulina"]
+TICK = 0.01
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mib():
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _create_hass(config_dir):
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    try:
+        from homeassistant.helpers import frame
+
+        frame.async_setup(hass)
+    except (ImportError, AttributeError):
+        pass
+    try:
+        from aiohttp.resolver import ThreadedResolver
+        from homeassistant.helpers.aiohttp_client import DATA_RESOLVER
+
+        # Fără integrarea `network` (zeroconf), sesiunea HTTP a HA nu poate
+        # crea resolver-ul mDNS; pentru serverul local ajunge DNS-ul obișnuit.
+        hass.data[DATA_RESOLVER] = ThreadedResolver()
+    except ImportError:
+        pass
+    return hass
+
+
+async def _wait_for_server(base_url, timeout=15):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"{base_url}_stats") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Serverul de test nu răspunde la {base_url}")
+            await asyncio.sleep(0.2)
+
+
+async def _server_stats(base_url):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}_stats") as response:
+            return await response.json()
+
+
+def _setup_entries(hass, base_url, entries, interval, compact):
+    """Echivalentul `sensor.async_setup_entry` pentru `entries` intrări simulate."""
+    judete = sorted(JUDETE)
+    feeds = {}
+    sensors = []
+    for i in range(entries):
+        judet = judete[i % len(judete)]
+        localitate = LOCALITATI[i % len(LOCALITATI)]
+        entry_feeds = set()
+        for definition in SENSOR_DEFINITIONS:
+            data_format = definition.get("format", "json")
+            url = endpoint_url(base_url, definition)
+            # Fără min_interval/max_interval: toate endpoint-urile la `interval`.
+            feed = async_get_feed(
+                hass,
+                url,
+                "json" if data_format == "json" else "xml",
+                indexer=definition.get("indexer"),
+                alert_items=definition.get("alert_items"),
+                alert_events=definition.get("alert_events", True),
+            )
+            feeds[url] = feed
+            if url not in entry_feeds:
+                entry_feeds.add(url)
+                feed.async_register_interval(interval)
+            sensor = ANMSensors(
+                feed,
+                definition["endpoint"],
+                definition["name"],
+                entry_id=f"soak{i}",
+                localitate=localitate,
+                judet=judet,
+                judet_long=JUDETE[judet],
+                data_format=data_format,
+                compact_attributes=compact,
+            )
+            feed.async_add_listener(sensor._handle_coordinator_update)
+            sensors.append(sensor)
+    return feeds, sensors
+
+
+async def run(args, server_args):
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}/"
+        server = subprocess.Popen([
+            sys.executable, os.path.join(ROOT, "benchmarks", "anm_mock_server.py"),
+            "--port", str(port), *server_args,
+        ])
+    try:
+        await _wait_for_server(base_url)
+        with tempfile.TemporaryDirectory() as config_dir:
+            await _soak(args, base_url, config_dir)
+        if server is not None:
+            print("server:", await _server_stats(base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+async def _soak(args, base_url, config_dir):
+    hass = _create_hass(config_dir)
+    checks = Counter()
+    lags = []
+
+    feeds, sensors = _setup_entries(hass, base_url, args.entries, timedelta(seconds=args.interval), args.compact)
+    for feed in feeds.values():
+        def _checked(feed=feed):
+            checks["total"] += 1
+            checks["ok" if feed.last_check_success else "failed"] += 1
+
+        feed.async_add_check_listener(_checked)
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, time.perf_counter() - start - TICK))
+
+    tick = asyncio.create_task(ticker())
+    started = time.monotonic()
+    rss_start = _rss_mib()
+    await asyncio.gather(*(feed.async_ensure_data() for feed in feeds.values()))
+    for sensor in sensors:
+        sensor.async_process_feed()
+    print(
+        f"{args.entries} intrari, {len(sensors)} senzori, {len(feeds)} feed-uri, "
+        f"interval {args.interval}s, server {base_url}, RSS initial {rss_start:.1f} MiB"
+    )
+    print(f"{'timp':>7} {'verif/s':>8} {'ok %':>6} {'lag max':>9} {'lag p99':>9} {'RSS MiB':>8} {'parse ms':>9}")
+
+    last_total = 0
+    while time.monotonic() - started < args.duration:
+        await asyncio.sleep(args.report)
+        window, lags[:] = sorted(lags), []
+        total = checks["total"]
+        rate = (total - last_total) / args.report
+        last_total = total
+        ok = 100 * checks["ok"] / total if total else 0.0
+        lag_max = window[-1] * 1000 if window else 0.0
+        lag_p99 = window[int(len(window) * 0.99) - 1] * 1000 if window else 0.0
+        parse_ms = max((feed.stats["parse_ms"] or 0.0) for feed in feeds.values())
+        print(
+            f"{time.monotonic() - started:7.0f} {rate:8.2f} {ok:6.1f} {lag_max:7.1f}ms {lag_p99:7.1f}ms"
+            f" {_rss_mib():8.1f} {parse_ms:9.1f}"
+        )
+
+    tick.cancel()
+    for feed in feeds.values():
+        await feed.async_shutdown()
+    await hass.async_stop(force=True)
+    print(f"verificari: {dict(checks)}, RSS final {_rss_mib():.1f} MiB")
+
+
+def main():
+    argv = sys.argv[1:]
+    server_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, server_args = argv[:split], argv[split + 1:]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=5.0, help="secunde între interogări")
+    parser.add_argument("--duration", type=float, default=300.0, help="secunde")
+    parser.add_argument("--report", type=float, default=10.0, help="secunde între rapoarte")
+    parser.add_argument("--compact", action="store_true", help="atribute compacte")
+    parser.add_argument("--base-url", help="server deja pornit (implicit se pornește anm_mock_server.py)")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args, server_args))
+
+
+if __name__ == "__main__":
+    main()
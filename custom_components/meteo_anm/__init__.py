@@ -1,10 +1,15 @@
 from .static_config import JUDETE
 
 DOMAIN = "meteo_anm"
+FEEDS = "feeds"
+BREAKERS = "breakers"
+CACHE = "cache"
+ENTITIES = "entities"
+DIAGNOSTICS = "diagnostics"
+LAST_CHECK = "last_check"
 
 
 async def async_setup_entry(hass, config_entry):
-    await _ensure_assets(hass)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][config_entry.entry_id] = config_entry.add_update_listener(async_reload_entry)
 
@@ -15,18 +20,106 @@ async def async_setup_entry(hass, config_entry):
 async def async_unload_entry(hass, config_entry):
     unload_ok = await hass.config_entries.async_unload_platforms(config_entry, ["sensor"])
 
-    unsub = hass.data.get(DOMAIN, {}).pop(config_entry.entry_id, None)
+    domain_data = hass.data.get(DOMAIN, {})
+    unsub = domain_data.pop(config_entry.entry_id, None)
     if unsub:
         unsub()
-    if not hass.data.get(DOMAIN):
+    entities = domain_data.get(ENTITIES, {})
+    entities.pop(config_entry.entry_id, None)
+    if entities:
+        # Senzorii de diagnostic ai intrării descărcate trec la altă intrare.
+        from .sensor import async_add_diagnostic_sensors
+
+        async_add_diagnostic_sensors(hass)
+    else:
+        domain_data.pop(ENTITIES, None)
+        domain_data.pop(DIAGNOSTICS, None)
+
+    feeds = domain_data.get(FEEDS, {})
+    for url, feed in list(feeds.items()):
+        if not feed.has_listeners:
+            await feed.async_shutdown()
+            feeds.pop(url)
+    if not feeds:
+        domain_data.pop(FEEDS, None)
+        domain_data.pop(BREAKERS, None)
+        cache = domain_data.pop(CACHE, None)
+        if cache is not None:
+            await cache.async_save()
+    if not domain_data:
         hass.data.pop(DOMAIN, None)
 
     return unload_ok
 
+def async_get_feed(hass, url, data_format="json", min_interval=None, max_interval=None, indexer=None, alert_items=None, alert_events=True):
+    """Feed-ul comun pentru `url`, partajat de toate intrările de configurare.
+
+    Astfel, N județe monitorizate costă o singură descărcare per endpoint.
+    """
+    from urllib.parse import urlsplit
+
+    from .feed import ANMFeed, FeedCache, HostCircuitBreaker
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    feeds = domain_data.setdefault(FEEDS, {})
+    cache = domain_data.get(CACHE)
+    if cache is None:
+        cache = domain_data[CACHE] = FeedCache(hass)
+    feed = feeds.get(url)
+    if feed is None:
+        # Un singur circuit breaker per host: când meteoromania.ro e degradat,
+        # toate endpoint-urile lui fac pauză împreună.
+        host = urlsplit(url).hostname or url
+        breakers = domain_data.setdefault(BREAKERS, {})
+        breaker = breakers.get(host)
+        if breaker is None:
+            breaker = breakers[host] = HostCircuitBreaker(host)
+        feed = feeds[url] = ANMFeed(
+            hass,
+            url,
+            data_format,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            breaker=breaker,
+            cache=cache,
+            indexer=indexer,
+            alert_items=alert_items,
+            alert_events=alert_events,
+        )
+    return feed
+
+
 async def async_setup(hass, config):
+    import voluptuous as vol
+    from homeassistant.core import SupportsResponse
+
+    from .frontend import async_register_frontend
+    from .parsing import get_message
+
+    async def _handle_get_message(call):
+        mesaj_hash = call.data["mesaj_hash"]
+        return {"mesaj_hash": mesaj_hash, "mesaj": get_message(mesaj_hash)}
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_message",
+        _handle_get_message,
+        schema=vol.Schema({vol.Required("mesaj_hash"): str}),
+        supports_response=SupportsResponse.ONLY,
+    )
+    await async_register_frontend(hass)
     return True
 
 
+async def async_remove_entry(hass, config_entry):
+    """La ștergerea ultimei intrări, ștergem și cache-ul feed-urilor de pe disc."""
+    if any(e.entry_id != config_entry.entry_id for e in hass.config_entries.async_entries(DOMAIN)):
+        return
+    from .feed import FeedCache
+
+    await FeedCache(hass).async_remove()
+
+
 async def async_reload_entry(hass, entry):
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -58,25 +151,3 @@ async def async_migrate_entry(hass, config_entry):
         version=2,
     )
     return True
-
-
-async def _ensure_assets(hass):
-    """Copy bundled frontend assets (svg + card) into /config/www/ if missing."""
-    import os
-    import shutil
-
-    src_dir = os.path.dirname(__file__)
-    www_dir = hass.config.path("www")
-    assets = {
-        "anm-harta.svg": "anm-harta.svg",
-        "anm-map-card.js": "anm-map-card.js",
-    }
-
-    def _copy():
-        os.makedirs(www_dir, exist_ok=True)
-        for src_name, dest_name in assets.items():
-            src_path = os.path.join(src_dir, src_name)
-            dest_path = os.path.join(www_dir, dest_name)
-            shutil.copyfile(src_path, dest_path)
-
-    await hass.async_add_executor_job(_copy)
@@ -1,3 +1,18 @@
+// Harta este servită lângă card, cu aceeași versiune (`?v=<hash>`) ca modulul;
+// încărcat din /local/, cardul folosește /local/anm-harta.svg ca înainte.
+const MAP_URL = (() => {
+  const url = new URL("anm-harta.svg", import.meta.url);
+  url.search = new URL(import.meta.url).search;
+  return url.pathname + url.search;
+})();
+// Fără hartă în integrare sau în /config/www, /meteo_anm/anm-harta.svg nu există.
+const FALLBACK_MAP_URL = "/local/anm-harta.svg";
+
+const fetchMap = url => fetch(url).then(r => {
+  if (!r.ok) throw new Error(`${url}: HTTP ${r.status}`);
+  return r.text();
+});
+
 class AnmMapCard extends HTMLElement {
   static getConfigElement() { return null; }
   static getStubConfig() { return { entity: "sensor.harta_avertizari_anm" }; }
@@ -10,64 +25,93 @@ class AnmMapCard extends HTMLElement {
     this.shadowRoot.innerHTML = `<style>:host{display:block} .holder{width:100%;height:auto} .nav{display:flex;align-items:center;margin-top:6px;gap:6px} .nav button{padding:2px 6px;border:1px solid #888;border-radius:4px;background:#f5f5f5;cursor:pointer} .nav button:disabled{opacity:0.5;cursor:default} .meta{margin-top:8px;font-size:14px;line-height:1.4}</style><div class="holder"></div>`;
     this._container = this.shadowRoot.querySelector(".holder");
     if (!this._svgPromise) {
-      const MAP_URL = "/local/anm-harta.svg";
-      this._svgPromise = fetch(MAP_URL)
-        .then(r => r.text())
+      this._svgPromise = fetchMap(MAP_URL)
+        .catch(err => MAP_URL.split("?")[0] === FALLBACK_MAP_URL ? Promise.reject(err) : fetchMap(FALLBACK_MAP_URL))
         .then(txt => new DOMParser().parseFromString(txt, "image/svg+xml").documentElement)
         .catch(err => { console.error("ANM map fetch failed", err); return null; });
     }
   }
 
-  _renderFromState() {
-    if (!this._svgEl || !this._stateCache) return;
-    const { maps, shapesFallback, metaFallback } = this._stateCache;
-
-    const mapCount = maps.length;
-    if (mapCount && this._mapIndex >= mapCount) this._mapIndex = 0;
-    const current = mapCount ? maps[this._mapIndex] : null;
-    const shapes = current ? (current.shapes || []) : (shapesFallback || []);
-    const meta = current ? current.meta : metaFallback;
+  // SVG-ul este inserat o singură dată; la actualizări se schimbă doar clasele.
+  _attachSvg(svg) {
+    this._svgEl = svg;
+    this._shapeEls = Array.from(svg.querySelectorAll("[data-judet], [data-munte], path.judet, polygon.judet, path.munte, polygon.munte"));
+    this._byId = new Map(Array.from(svg.querySelectorAll("[id]")).map(el => [el.id, el]));
+    this._shapeEls.forEach(el => this._setCodClass(el, "cod0"));
+    this._applied = new Set();
+    this._info = document.createElement("div");
+    this._info.className = "meta";
+    this._container.innerHTML = "";
+    this._container.appendChild(svg);
+    this._container.appendChild(this._info);
+  }
 
-    const clone = this._svgEl.cloneNode(true);
-    const codClasses = ["cod0", "cod1", "cod2", "cod3"];
-    const setCodClass = (el, codClass) => {
-      codClasses.forEach(c => el.classList.remove(c));
-      el.classList.add(codClass);
-    };
+  _setCodClass(el, codClass) {
+    el.classList.remove("cod0", "cod1", "cod2", "cod3");
+    el.classList.add(codClass);
+  }
 
-    // Reset to cod0 (green) for all shapes
-    clone.querySelectorAll("[data-judet], [data-munte], path.judet, polygon.judet, path.munte, polygon.munte").forEach(el => {
-      setCodClass(el, "cod0");
+  // Harta id -> clasă calculată de integrare (indexul anm-harta.svg).
+  _applyColors(colors) {
+    if (this._applied) {
+      this._applied.forEach(id => {
+        if (!(id in colors)) this._setCodClass(this._byId.get(id), "cod0");
+      });
+    } else {
+      this._shapeEls.forEach(el => this._setCodClass(el, "cod0"));
+    }
+    this._applied = new Set();
+    Object.entries(colors).forEach(([id, codClass]) => {
+      const el = this._byId.get(id);
+      if (!el) return;
+      this._setCodClass(el, codClass);
+      this._applied.add(id);
     });
+  }
 
-    // Apply alert colors
+  // Fără `colors` (SVG lipsă pe server / senzor vechi): căutare în DOM.
+  _applyShapes(shapes) {
+    this._shapeEls.forEach(el => this._setCodClass(el, "cod0"));
+    this._applied = null;
+    const candidates = Array.from(this._svgEl.querySelectorAll("[data-judet],[data-munte],[id],[class]")).map(el => [el, [
+      el.getAttribute("data-judet"),
+      el.getAttribute("data-munte"),
+      el.id,
+      ...(el.getAttribute("class") || "").split(/\s+/)
+    ].filter(Boolean).map(v => v.toUpperCase())]);
     (shapes || []).forEach(shape => {
       const raw = (shape.id || "").toUpperCase();
-      const candidates = [raw, raw.toLowerCase()];
       const codClass = { "1": "cod1", "2": "cod2", "3": "cod3" }[shape.culoare] || "cod1";
-      const matches = Array.from(clone.querySelectorAll("[data-judet],[data-munte],[id],[class]")).filter(el => {
-        const attrs = [
-          el.getAttribute("data-judet"),
-          el.getAttribute("data-munte"),
-          el.id,
-          ...(el.className || "").toString().split(/\s+/)
-        ].filter(Boolean).map(v => v.toUpperCase());
-        return attrs.some(v => candidates.some(c => v.endsWith(c.toUpperCase())));
+      candidates.forEach(([el, attrs]) => {
+        if (attrs.some(v => v.endsWith(raw))) this._setCodClass(el, codClass);
       });
-      matches.forEach(el => setCodClass(el, codClass));
     });
+  }
 
-    // Build UI
-    const wrapper = document.createElement("div");
-    wrapper.appendChild(clone);
+  _renderFromState() {
+    if (!this._svgEl || !this._stateCache) return;
+    const { maps, shapesFallback, metaFallback } = this._stateCache;
 
+    const mapCount = maps.length;
+    if (mapCount && this._mapIndex >= mapCount) this._mapIndex = 0;
+    const current = mapCount ? maps[this._mapIndex] : null;
+    const shapes = current ? (current.shapes || []) : (shapesFallback || []);
+    const meta = current ? current.meta : metaFallback;
+
+    if (current && current.colors) {
+      this._applyColors(current.colors);
+    } else {
+      this._applyShapes(shapes);
+    }
+
+    const info = this._info;
+    info.innerHTML = "";
     if (meta || mapCount > 0) {
-      const info = document.createElement("div");
-      info.className = "meta";
       if (meta) {
+        const mesaj = meta.mesaj || this._message(meta.mesaj_hash);
         info.innerHTML = `
           <div><strong>${meta.tip_mesaj || ""}</strong></div>
-          <div>${meta.mesaj || ""}</div>
+          <div>${mesaj || ""}</div>
           <div>${meta.data_aparitiei || ""} - ${meta.data_expirarii || ""}</div>
         `;
       }
@@ -89,25 +133,43 @@ class AnmMapCard extends HTMLElement {
         nav.appendChild(next);
         info.appendChild(nav);
       }
-      wrapper.appendChild(info);
     }
+  }
 
-    this._container.innerHTML = "";
-    this._container.appendChild(wrapper);
+  // Cu atribute compacte, senzorul expune doar mesaj_hash; textul complet
+  // se cere o singură dată prin serviciul meteo_anm.get_message.
+  _message(hash) {
+    if (!hash || !this._hass) return "";
+    this._messages = this._messages || {};
+    if (hash in this._messages) return this._messages[hash];
+    this._messages[hash] = "";
+    this._hass.callWS({
+      type: "call_service",
+      domain: "meteo_anm",
+      service: "get_message",
+      service_data: { mesaj_hash: hash },
+      return_response: true,
+    }).then(res => {
+      this._messages[hash] = (res && res.response && res.response.mesaj) || "";
+      if (this._messages[hash]) this._renderFromState();
+    }).catch(err => console.error("ANM message fetch failed", err));
+    return "";
   }
 
   set hass(hass) {
     this._hass = hass;
     if (!this.config || !this._svgPromise) return;
     const stateObj = hass.states[this.config.entity];
-    if (!stateObj) return;
+    // `hass` se schimbă la orice entitate; redesenăm doar când senzorul se schimbă.
+    if (!stateObj || stateObj === this._stateObj) return;
+    this._stateObj = stateObj;
     const attrs = stateObj.attributes || {};
     const rawMaps = attrs.maps;
     const maps = Array.isArray(rawMaps) ? rawMaps : (rawMaps ? Object.values(rawMaps) : []);
     if (!attrs.shapes && !maps.length) return;
     this._svgPromise.then(svg => {
       if (!svg) return console.error("ANM map SVG not loaded");
-      this._svgEl = svg;
+      if (this._svgEl !== svg) this._attachSvg(svg);
       this._stateCache = {
         maps,
         shapesFallback: attrs.shapes || [],
@@ -120,4 +182,4 @@ class AnmMapCard extends HTMLElement {
   getCardSize() { return 4; }
 }
 
-customElements.define("anm-map-card", AnmMapCard);
+if (!customElements.get("anm-map-card")) customElements.define("anm-map-card", AnmMapCard);
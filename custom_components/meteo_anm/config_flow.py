@@ -2,7 +2,8 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
-from .static_config import JUDETE
+from .parsing import parse_localitati
+from .static_config import DEFAULT_BASE_URL, JUDETE
 
 class AlertaANMConfigFlow(config_entries.ConfigFlow, domain="meteo_anm"):
     VERSION = 2
@@ -13,10 +14,10 @@ class AlertaANMConfigFlow(config_entries.ConfigFlow, domain="meteo_anm"):
             # Validăm datele introduse
             update_interval = user_input.get("update_interval")
             judet = (user_input.get("judet") or "").strip().upper()
-            localitate = user_input.get("localitate")
+            localitate = ", ".join(parse_localitati(user_input.get("localitate")))
             judet_long =  JUDETE.get(judet, judet)
             if update_interval and update_interval >= 60 and judet:
-                cleaned_input = {**user_input, "judet": judet, "judet_long": judet_long}
+                cleaned_input = {**user_input, "localitate": localitate, "judet": judet, "judet_long": judet_long}
                 return self.async_create_entry(title=f"Prognoza Meteo si Avertizari by ANM - {judet_long} / {judet}", data=cleaned_input)
             errors["base"] = "invalid_interval" if not update_interval or update_interval < 60 else "invalid_judet"
 
@@ -27,10 +28,14 @@ class AlertaANMConfigFlow(config_entries.ConfigFlow, domain="meteo_anm"):
         # Formulăm schema de configurare
         schema = vol.Schema({
             vol.Optional("update_interval", default=180): vol.All(cv.positive_int, vol.Range(min=60)),  # secunde (>=60)
-            vol.Required("localitate", default="Bucuresti"): cv.string,
+            vol.Required("localitate", default="Bucuresti"): cv.string,  # una sau mai multe, separate prin virgulă
             vol.Required("judet", default="B"): vol.In(judete_sortate), #vol.All(cv.string, vol.Length(min=1, max=2)),
+            vol.Optional("compact_attributes", default=False): cv.boolean,  # atribute compacte (hash mesaj în loc de text)
             # vol.Required("judet_long", default="Bucuresti"): cv.string,
         })
+        if self.show_advanced_options:
+            # Alt server (teste de încărcare), doar în modul avansat.
+            schema = schema.extend({vol.Optional("base_url", default=DEFAULT_BASE_URL): cv.url})
 
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
@@ -52,7 +57,11 @@ class AlertaANMOptionsFlowHandler(config_entries.OptionsFlow):
             judet_long = JUDETE.get(judet, judet)
             new_title = f"Prognoza Meteo si Avertizari by ANM - {judet_long} / {judet}"
             self.hass.config_entries.async_update_entry(self._config_entry, title=new_title)
-            return self.async_create_entry(title="", data={**user_input, "judet": judet, "judet_long": judet_long})
+            localitate = ", ".join(parse_localitati(user_input.get("localitate")))
+            data = {**user_input, "localitate": localitate, "judet": judet, "judet_long": judet_long}
+            if "base_url" not in data and self._config_entry.options.get("base_url"):
+                data["base_url"] = self._config_entry.options["base_url"]
+            return self.async_create_entry(title="", data=data)
             
         judete_sortate = {k: v for k, v in sorted(JUDETE.items(), key=lambda x: x[1])}
 
@@ -61,7 +70,12 @@ class AlertaANMOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Required("localitate", default=self._config_entry.options.get("localitate", self._config_entry.data.get("localitate", "Bucuresti"))): cv.string,
             # vol.Required("judet", default=self._config_entry.options.get("judet", self._config_entry.data.get("judet", "B"))): vol.All(cv.string, vol.Length(min=1, max=2)),
             vol.Required("judet", default=self._config_entry.options.get("judet", self._config_entry.data.get("judet", "B"))): vol.In(judete_sortate), #vol.All(cv.string, vol.Length(min=1, max=2)),
+            vol.Optional("compact_attributes", default=self._config_entry.options.get("compact_attributes", self._config_entry.data.get("compact_attributes", False))): cv.boolean,
             # vol.Required("judet_long", default=self._config_entry.options.get("judet_long", self._config_entry.data.get("judet_long", "Bucuresti"))): cv.string,
         })
+        if self.show_advanced_options:
+            schema = schema.extend({
+                vol.Optional("base_url", default=self._config_entry.options.get("base_url", self._config_entry.data.get("base_url", DEFAULT_BASE_URL))): cv.url,
+            })
 
         return self.async_show_form(step_id="user", data_schema=schema)
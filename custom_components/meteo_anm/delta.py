@@ -0,0 +1,137 @@
+"""Diferențele între două payload-uri de avertizări, independent de HA.
+
+Fiecare alertă (un județ sau o zonă dintr-o avertizare XML, respectiv o
+avertizare nowcasting) are o cheie stabilă: tipul, momentul apariției și
+județul/zona. Culoarea este valoarea urmărită: aceeași cheie cu o culoare
+mai gravă este o agravare (`upgraded`), iar o culoare mai slabă înseamnă
+că alerta veche a expirat și a apărut una nouă.
+"""
+from .parsing import message_hash, normalize, parse_anm_datetime
+
+EVENT_ALERT_ADDED = "meteo_anm_alert_added"
+EVENT_ALERT_UPGRADED = "meteo_anm_alert_upgraded"
+EVENT_ALERT_EXPIRED = "meteo_anm_alert_expired"
+
+_COLOR_LEVELS = {"GALBEN": 1, "PORTOCALIU": 2, "ROSU": 3}
+
+
+def color_level(culoare):
+    """Gravitatea culorii: 1 galben, 2 portocaliu, 3 roșu; 0 dacă nu e recunoscută."""
+    text = normalize(culoare if isinstance(culoare, str) else str(culoare or ""))
+    for char in text:
+        if char.isdigit():
+            return int(char)
+    for name, level in _COLOR_LEVELS.items():
+        if name in text:
+            return level
+    return 0
+
+
+def alert_items_xml(model):
+    """Alertele active din modelul XML, indexate după cheia stabilă."""
+    return _model_alert_items(model, "xml")
+
+
+def alert_items_generale(model):
+    """Alertele din avertizari-generale (același model, vezi `index_avertizari_generale`)."""
+    return _model_alert_items(model, "generale")
+
+
+def _model_alert_items(model, sursa):
+    items = {}
+    for avertizare in model or []:
+        tip_mesaj = avertizare.tip_mesaj
+        data_aparitiei = avertizare.data_aparitiei
+        mesaj_hash = None
+        for element in avertizare.elemente:
+            nivel = color_level(element.culoare)
+            if not nivel:
+                continue
+            if mesaj_hash is None:
+                mesaj_hash = message_hash(avertizare.mesaj)
+            items[(sursa, tip_mesaj, data_aparitiei, element.tag, element.cod)] = {
+                "sursa": sursa,
+                "tip_mesaj": tip_mesaj,
+                "data_aparitiei": data_aparitiei,
+                "data_expirarii": avertizare.data_expirarii,
+                "fenomene_vizate": avertizare.fenomene_vizate,
+                element.tag: element.cod,
+                "culoare": element.culoare,
+                "nivel": nivel,
+                "mesaj_hash": mesaj_hash,
+            }
+    return items
+
+
+def alert_end(item):
+    """Momentul expirării unei alerte (`data_expirarii` / `data_sfarsit`), sau None."""
+    return parse_anm_datetime(item.get("data_expirarii") or item.get("data_sfarsit"))
+
+
+def has_current_alerts(items, now):
+    """Există alerte care nu au expirat la `now` (anunțate sau active).
+
+    ANM păstrează în feed și alerte expirate; ele nu țin feed-ul treaz.
+    """
+    for item in items.values():
+        end = alert_end(item)
+        if end is None or end > now:
+            return True
+    return False
+
+
+def alert_items_nowcasting(index):
+    """Alertele din indexul nowcasting (`index_avertizari_nowcasting`)."""
+    items = {}
+    for entry in index.avertizari if index is not None else []:
+        key = ("nowcasting", entry.get("tip_mesaj"), entry.get("creat") or entry.get("data_inceput"), entry.get("zona"))
+        items[key] = {"sursa": "nowcasting", **entry, "nivel": color_level(entry.get("culoare"))}
+    return items
+
+
+class AlertTracker:
+    """Ultimul set de alerte văzut; `update` întoarce doar ce s-a schimbat.
+
+    Primul set (de la pornire sau din cache) devine referința și nu produce
+    diferențe, ca o repornire să nu anunțe din nou toate alertele. Cu `now`,
+    o alertă trecută de ora expirării contează ca expirată chiar dacă ANM o
+    păstrează în feed (vezi `next_expiry`).
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        self._items = None
+
+    def update(self, items, now=None):
+        """Întoarce `(added, upgraded, expired)`; `upgraded` are și `culoare_anterioara`."""
+        if now is not None:
+            items = {key: item for key, item in items.items() if not _ended(item, now)}
+        previous, self._items = self._items, items
+        if previous is None:
+            return [], [], []
+        added = []
+        upgraded = []
+        for key, item in items.items():
+            old = previous.get(key)
+            if old is None:
+                added.append(item)
+            elif item["nivel"] > old["nivel"]:
+                upgraded.append({**item, "culoare_anterioara": old["culoare"]})
+            elif item["nivel"] < old["nivel"]:
+                added.append(item)
+        expired = [
+            old for key, old in previous.items()
+            if key not in items or items[key]["nivel"] < old["nivel"]
+        ]
+        return added, upgraded, expired
+
+    def next_expiry(self):
+        """Cea mai apropiată oră de expirare a alertelor curente, sau None."""
+        ends = [end for end in map(alert_end, (self._items or {}).values()) if end is not None]
+        return min(ends, default=None)
+
+
+def _ended(item, now):
+    end = alert_end(item)
+    return end is not None and end <= now
@@ -0,0 +1,29 @@
+"""Diagnostics pentru intrările meteo_anm (Setări > Dispozitive > Descarcă diagnostice)."""
+from . import DOMAIN, ENTITIES, FEEDS
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    domain_data = hass.data.get(DOMAIN, {})
+    entry = domain_data.get(ENTITIES, {}).get(config_entry.entry_id, {})
+    feeds = domain_data.get(FEEDS, {})
+    endpoints = {}
+    for url, endpoint in entry.get("endpoints", {}).items():
+        feed = feeds[url]
+        endpoints[endpoint] = {
+            "url": url,
+            **feed.diagnostics(),
+            # Scrierile de stare ale senzorilor acestei intrări; `state_writes`
+            # de mai sus le numără pe ale tuturor intrărilor feed-ului.
+            "state_writes_entitati": {
+                sensor.entity_id or sensor.unique_id: sensor.state_writes
+                for sensor in entry["sensors"]
+                if sensor.coordinator is feed
+            },
+        }
+    return {
+        "entry": {
+            "data": dict(config_entry.data),
+            "options": dict(config_entry.options),
+        },
+        "endpoints": endpoints,
+    }
@@ -0,0 +1,643 @@
+import asyncio
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import random
+import time
+import xml.etree.ElementTree as ET
+
+import aiohttp
+import async_timeout
+from aiohttp import hdrs
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .delta import (
+    EVENT_ALERT_ADDED,
+    EVENT_ALERT_EXPIRED,
+    EVENT_ALERT_UPGRADED,
+    AlertTracker,
+    has_current_alerts,
+)
+from .parsing import (
+    AVERTIZARI_MODEL_VERSION,
+    AvertizariXmlParser,
+    dump_avertizari_model,
+    load_avertizari_model,
+    parse_avertizari_xml,
+    prepare_avertizari_model,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 16 * 1024
+# Peste acest prag, decodarea și normalizarea payload-ului se fac în
+# executor; sub el, saltul între fire costă mai mult decât parsarea.
+EXECUTOR_PARSE_THRESHOLD = 64 * 1024
+
+# Decalaj aleator adăugat fiecărui interval (fracțiune din interval, plafonat),
+# ca instalările pornite simultan să nu interogheze meteoromania.ro sincron.
+JITTER_FRACTION = 0.1
+MAX_JITTER = timedelta(seconds=30)
+
+# Fără nicio alertă neexpirată în feed (țara e verde), interogăm de atâtea ori mai rar,
+# dar nu mai rar decât QUIET_MAX_INTERVAL (și niciodată peste `max_interval`).
+QUIET_INTERVAL_FACTOR = 3
+QUIET_MAX_INTERVAL = timedelta(minutes=15)
+
+REQUEST_TIMEOUT = 5
+# Reîncercări în aceeași actualizare, cu pauză exponențială plafonată.
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 8.0
+# După atâtea actualizări eșuate consecutiv, circuitul host-ului se deschide
+# și nu mai trimitem cereri până la `next_attempt` (pauză dublată la fiecare
+# eșec ulterior, plafonată).
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_COOLDOWN = timedelta(minutes=2)
+BREAKER_MAX_COOLDOWN = timedelta(minutes=30)
+
+
+STORAGE_VERSION = 1
+STORAGE_KEY = "meteo_anm.feed_cache"
+CACHE_SAVE_DELAY = 30
+
+
+class _RetryableError(Exception):
+    """Eroare temporară (timeout, conexiune, HTTP 5xx/429) care merită reîncercată."""
+
+
+class HostCircuitBreaker:
+    """Circuit breaker comun tuturor feed-urilor de pe același host.
+
+    `closed`: cererile trec; `open`: nu trimitem nimic până la `next_attempt`,
+    iar senzorii păstrează ultimele date bune; `half_open`: după pauză, prima
+    actualizare testează host-ul și închide sau redeschide circuitul.
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.next_attempt = None
+
+    def allow_request(self):
+        if self.state != "open":
+            return True
+        if dt_util.utcnow() < self.next_attempt:
+            return False
+        self.state = "half_open"
+        return True
+
+    def record_success(self):
+        if self.state != "closed":
+            _LOGGER.info("Host ANM %s răspunde din nou; circuit închis.", self.host)
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.next_attempt = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.consecutive_failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        exponent = self.consecutive_failures - BREAKER_FAILURE_THRESHOLD
+        cooldown = min(BREAKER_BASE_COOLDOWN * (2 ** min(exponent, 8)), BREAKER_MAX_COOLDOWN)
+        self.next_attempt = dt_util.utcnow() + cooldown
+        if self.state != "open":
+            _LOGGER.warning(
+                "Host ANM %s: %s erori consecutive, pauză până la %s.",
+                self.host, self.consecutive_failures, self.next_attempt.isoformat(),
+            )
+        self.state = "open"
+
+    def as_dict(self):
+        return {
+            "circuit": self.state,
+            "erori_consecutive": self.consecutive_failures,
+            "urmatoarea_incercare": self.next_attempt.isoformat() if self.next_attempt else None,
+        }
+
+
+class FeedCache:
+    """Ultimul payload bun al fiecărui feed, persistat cu `Store`.
+
+    La pornire, senzorii primesc imediat datele salvate (și validatorii HTTP,
+    pentru o primă cerere condițională), iar descărcarea se face în fundal.
+    Modelul XML este salvat fără indecșii derivați; scrierea pe disc este
+    amânată și făcută de `Store` în afara event loop-ului.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._entries = {}
+        self._load_task = None
+
+    async def async_load(self):
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await asyncio.shield(self._load_task)
+
+    async def _async_load(self):
+        try:
+            data = await self._store.async_load() or {}
+        except Exception as err:
+            _LOGGER.warning("Cache-ul feed-urilor ANM nu a putut fi citit: %s", err)
+            data = {}
+        self._entries = {**data.get("feeds", {}), **self._entries}
+
+    def get(self, url):
+        return self._entries.get(url)
+
+    @callback
+    def async_schedule_save(self, url, entry):
+        self._entries[url] = entry
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        return {"feeds": self._entries}
+
+    async def async_save(self):
+        if self._load_task is not None:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        await self._store.async_remove()
+
+
+class ANMFeed(DataUpdateCoordinator):
+    """Un URL ANM descărcat și parsat o singură dată, partajat de toate intrările.
+
+    Senzorii tuturor intrărilor sunt `CoordinatorEntity` pe același feed (vezi
+    `async_get_feed` din __init__.py) și aplică doar filtrul propriu.
+    """
+
+    def __init__(self, hass, url, data_format="json", min_interval=None, max_interval=None, breaker=None, cache=None, indexer=None, alert_items=None, alert_events=True):
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=None,
+            name=f"ANM {url}",
+            update_interval=None,
+            always_update=False,
+        )
+        self.url = url
+        self.data_format = data_format
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self.breaker = breaker or HostCircuitBreaker(url)
+        self._cache = cache
+        self._indexer = indexer
+        self._index = (None, None)
+        self._alert_items = alert_items
+        # Fără `alert_events`, alertele decid doar intervalul (`_is_quiet`).
+        self._alert_tracker = AlertTracker() if alert_items and alert_events else None
+        self._alerts = None
+        self._unsub_expiry = None
+        self._requested_intervals = {}
+        self._base_interval = None
+        self._first_refresh = None
+        self.last_checked = None
+        self.last_check_success = None
+        self._check_listeners = {}
+        self._etag = None
+        self._last_modified = None
+        self._content_hash = None
+        # Mărimea ultimului payload primit (200), pentru `_stream_parse`.
+        self._payload_size = None
+        self.stats = {
+            "not_modified": 0,
+            "unchanged": 0,
+            "changed": 0,
+            "executor_parses": 0,
+            "parse_ms": None,
+            "loop_block_ms": None,
+            "fetch_ms": None,
+            "bytes": None,
+            "bytes_total": 0,
+            "consecutive_failures": 0,
+            "state_writes": 0,
+        }
+
+    @property
+    def has_listeners(self):
+        return bool(self._listeners)
+
+    @callback
+    def async_register_interval(self, update_interval):
+        """Intervalul cerut de o intrare; întoarce funcția de anulare (pentru unload)."""
+        token = object()
+        self._requested_intervals[token] = update_interval
+        self._async_update_base_interval()
+
+        @callback
+        def remove_interval():
+            self._requested_intervals.pop(token, None)
+            self._async_update_base_interval()
+
+        return remove_interval
+
+    @callback
+    def _async_update_base_interval(self):
+        interval = min(self._requested_intervals.values(), default=None)
+        if interval is not None and self._min_interval:
+            interval = max(interval, self._min_interval)
+        if interval is not None and self._max_interval:
+            interval = min(interval, self._max_interval)
+        if interval == self._base_interval:
+            return
+        self._base_interval = interval
+        self.update_interval = self._next_interval()
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _next_interval(self):
+        """Cel mai mic interval cerut de intrări, limitat la `min_interval` /
+        `max_interval`, plus un decalaj aleator; mai rar cât timp feed-ul nu
+        are alerte neexpirate (`QUIET_INTERVAL_FACTOR`)."""
+        if self._base_interval is None:
+            return None
+        base = self._base_interval
+        if self._is_quiet():
+            base = max(base, min(base * QUIET_INTERVAL_FACTOR, QUIET_MAX_INTERVAL))
+            if self._max_interval:
+                base = min(base, self._max_interval)
+        jitter = min(base * JITTER_FRACTION, MAX_JITTER)
+        interval = base + jitter * random.random()
+        if self.breaker.state == "open" and self.breaker.next_attempt:
+            # Circuit deschis: nu programăm nimic înainte de următoarea încercare.
+            interval = max(interval, self.breaker.next_attempt - dt_util.utcnow())
+        return interval
+
+    @callback
+    def async_add_check_listener(self, check_callback):
+        """Notificare după fiecare verificare, chiar dacă payload-ul nu s-a schimbat.
+
+        Nu influențează intervalul de actualizare (folosit de senzorii de diagnostic).
+        """
+        token = object()
+        self._check_listeners[token] = check_callback
+
+        @callback
+        def remove_listener():
+            self._check_listeners.pop(token, None)
+
+        return remove_listener
+
+    @callback
+    def async_get_index(self):
+        """Indexul payload-ului curent; construit pe loc doar dacă lipsește."""
+        if self._indexer is None or self.data is None:
+            return None
+        return self._index_for(self.data)
+
+    def _index_for(self, data):
+        source, index = self._index
+        if source is not data:
+            index = self._indexer(data)
+            self._index = (data, index)
+        return index
+
+    async def _async_build_index(self, data):
+        if self._indexer is not None and data is not None:
+            self._index = (data, await self.hass.async_add_executor_job(self._indexer, data))
+
+    @callback
+    def _async_track_alerts(self, data):
+        """Trimite pe bus alertele schimbate față de payload-ul anterior (`alert_items`)."""
+        if self._alert_items is None:
+            return
+        source = self._index_for(data) if self._indexer is not None else data
+        self._alerts = self._alert_items(source)
+        self._async_update_alerts()
+
+    @callback
+    def _async_update_alerts(self, _now=None):
+        """Evenimentele pentru alertele schimbate; reprogramat la următoarea expirare."""
+        if self._alert_tracker is None:
+            return
+        added, upgraded, expired = self._alert_tracker.update(self._alerts, dt_util.utcnow())
+        for event_type, alerte in (
+            (EVENT_ALERT_ADDED, added),
+            (EVENT_ALERT_UPGRADED, upgraded),
+            (EVENT_ALERT_EXPIRED, expired),
+        ):
+            if alerte:
+                self.hass.bus.async_fire(event_type, {"url": self.url, "alerte": alerte})
+        self._async_cancel_expiry()
+        when = self._alert_tracker.next_expiry()
+        if when is not None:
+            self._unsub_expiry = async_track_point_in_utc_time(self.hass, self._async_update_alerts, when)
+
+    @callback
+    def _async_cancel_expiry(self):
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    def _is_quiet(self):
+        """Nicio alertă neexpirată acum; reevaluat la fiecare programare."""
+        return self._alerts is not None and not has_current_alerts(self._alerts, dt_util.utcnow())
+
+    async def async_shutdown(self):
+        self._async_cancel_expiry()
+        self._check_listeners.clear()
+        self._requested_intervals.clear()
+        await super().async_shutdown()
+
+    async def async_ensure_data(self):
+        """Refolosește ultimul payload bun (din memorie sau din cache-ul de pe disc).
+
+        Doar dacă nu există niciunul, descărcarea blochează setup-ul; intrările
+        configurate simultan așteaptă aceeași primă încărcare.
+        """
+        if self.data is not None:
+            return True
+        if self._first_refresh is None:
+            self._first_refresh = self.hass.async_create_task(self._async_first_refresh())
+            self._first_refresh.add_done_callback(self._clear_first_refresh)
+        await asyncio.shield(self._first_refresh)
+        return self.data is not None
+
+    @callback
+    def _clear_first_refresh(self, _task):
+        self._first_refresh = None
+
+    async def _async_first_refresh(self):
+        if await self._async_restore():
+            self.hass.async_create_background_task(self.async_refresh(), f"{self.name} refresh")
+            return
+        await self.async_refresh()
+
+    async def _async_restore(self):
+        if self._cache is None:
+            return False
+        await self._cache.async_load()
+        entry = self._cache.get(self.url)
+        if not entry or entry.get("data") is None:
+            return False
+        try:
+            data = entry["data"]
+            if self.data_format == "xml":
+                data = load_avertizari_model(data)
+        except (KeyError, TypeError, ValueError) as err:
+            if self.data_format == "xml" and entry.get("model") != AVERTIZARI_MODEL_VERSION:
+                _LOGGER.debug("Cache %s salvat de o versiune mai veche, ignorat", self.url)
+            else:
+                _LOGGER.warning("Cache invalid pentru %s: %s", self.url, err)
+            return False
+        await self._async_build_index(data)
+        self.data = data
+        self._async_track_alerts(data)
+        # Un model XML salvat de o versiune mai veche este folosit fără
+        # validatori, pentru ca prima cerere să aducă documentul complet.
+        if self.data_format != "xml" or entry.get("model") == AVERTIZARI_MODEL_VERSION:
+            self._etag = entry.get("etag")
+            self._last_modified = entry.get("last_modified")
+            self._content_hash = entry.get("content_hash")
+        _LOGGER.debug("Feed ANM %s restaurat din cache (salvat la %s)", self.url, entry.get("salvat"))
+        return True
+
+    @callback
+    def _async_cache_data(self, data):
+        if self._cache is None:
+            return
+        self._cache.async_schedule_save(self.url, {
+            "data": dump_avertizari_model(data) if self.data_format == "xml" else data,
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "content_hash": self._content_hash,
+            "model": AVERTIZARI_MODEL_VERSION if self.data_format == "xml" else None,
+            "salvat": dt_util.utcnow().isoformat(),
+        })
+
+    def diagnostics(self):
+        """Statisticile feed-ului plus rata răspunsurilor fără conținut nou."""
+        checks = self.stats["not_modified"] + self.stats["unchanged"] + self.stats["changed"]
+        unchanged = self.stats["not_modified"] + self.stats["unchanged"]
+        return {
+            "ultima_verificare": self.last_checked.isoformat() if self.last_checked else None,
+            "succes": self.last_check_success,
+            "interval": self.update_interval.total_seconds() if self.update_interval else None,
+            **self.stats,
+            "unchanged_ratio": round(unchanged / checks, 3) if checks else None,
+            **self.breaker.as_dict(),
+        }
+
+    async def _async_update_data(self):
+        try:
+            data = await self._async_fetch()
+        except UpdateFailed:
+            self.last_check_success = False
+            self.stats["consecutive_failures"] += 1
+            raise
+        else:
+            self.last_checked = dt_util.utcnow()
+            self.last_check_success = True
+            self.stats["consecutive_failures"] = 0
+            if data is not self.data:
+                self._async_cache_data(data)
+                await self._async_build_index(data)
+                self._async_track_alerts(data)
+            return data
+        finally:
+            self.update_interval = self._next_interval()
+            for check_callback in list(self._check_listeners.values()):
+                check_callback()
+
+    def _conditional_headers(self):
+        headers = {}
+        if self.data is None:
+            return headers
+        if self._etag:
+            headers[hdrs.IF_NONE_MATCH] = self._etag
+        if self._last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = self._last_modified
+        return headers
+
+    @callback
+    def _reset_validators(self):
+        self._etag = None
+        self._last_modified = None
+        self._content_hash = None
+        self._payload_size = None
+
+    def _stream_parse(self, content_length):
+        """Documentul XML este parsat din stream doar când lungimea arată deja unul nou.
+
+        Altfel (aceeași lungime sau fără Content-Length) corpul este citit și
+        comparat întâi prin hash, ca un payload neschimbat să nu fie parsat.
+        """
+        if self.data_format != "xml":
+            return False
+        if self.data is None or self._content_hash is None:
+            return True
+        return content_length is not None and content_length != self._payload_size
+
+    def _is_unchanged(self, content_hash):
+        if self.data is None or content_hash != self._content_hash:
+            return False
+        self.stats["unchanged"] += 1
+        _LOGGER.debug("Feed ANM %s neschimbat (hash identic)", self.url)
+        return True
+
+    async def _async_fetch(self):
+        """Descarcă feed-ul cu reîncercări, respectând circuitul host-ului."""
+        if not self.breaker.allow_request():
+            raise UpdateFailed(
+                f"Host ANM {self.breaker.host} indisponibil; "
+                f"următoarea încercare la {self.breaker.next_attempt.isoformat()}"
+            )
+
+        delay = RETRY_BASE_DELAY
+        for attempt in range(1, RETRY_ATTEMPTS + 1):
+            try:
+                data = await self._async_fetch_once()
+            except _RetryableError as err:
+                if attempt == RETRY_ATTEMPTS or not self.breaker.allow_request():
+                    self._reset_validators()
+                    self.breaker.record_failure()
+                    raise UpdateFailed(f"Eroare la preluarea datelor ANM de la {self.url}: {err}") from err
+                _LOGGER.debug("Reîncercare %s pentru %s în %.1fs: %s", attempt, self.url, delay, err)
+                await asyncio.sleep(delay * (1 + random.random() / 2))
+                delay = min(delay * 2, RETRY_MAX_DELAY)
+            except (ET.ParseError, json.JSONDecodeError) as err:
+                # Host-ul a răspuns; documentul invalid nu deschide circuitul.
+                self._reset_validators()
+                self.breaker.record_success()
+                raise UpdateFailed(f"Document invalid de la {self.url}: {err}") from err
+            except UpdateFailed:
+                # Răspuns HTTP neașteptat (ex. 404 pentru un endpoint): host-ul funcționează.
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                self._reset_validators()
+                self.breaker.record_failure()
+                raise UpdateFailed(f"Eroare la preluarea datelor ANM de la {self.url}: {e}") from e
+            else:
+                self.breaker.record_success()
+                return data
+
+    async def _async_fetch_once(self):
+        """O singură cerere; un payload neschimbat întoarce același obiect `self.data`.
+
+        Cererile sunt condiționale (ETag / Last-Modified); fără validatori,
+        comparăm hash-ul conținutului. Cu `always_update=False`, abonații sunt
+        notificați doar când datele diferă.
+        """
+        _LOGGER.debug("Descărcare feed ANM de la %s", self.url)
+        start = time.perf_counter()
+        self.stats["bytes"] = 0
+        try:
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                session = async_get_clientsession(self.hass)
+                async with session.get(self.url, headers=self._conditional_headers()) as response:
+                    if response.status == 304:
+                        self.stats["not_modified"] += 1
+                        _LOGGER.debug("Feed ANM %s nemodificat (304)", self.url)
+                        return self.data
+                    if response.status >= 500 or response.status == 429:
+                        raise _RetryableError(f"HTTP {response.status}")
+                    if response.status != 200:
+                        raise UpdateFailed(f"Eroare HTTP {response.status} la preluarea datelor ANM de la {self.url}")
+
+                    self._etag = response.headers.get(hdrs.ETAG)
+                    self._last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+                    body = None
+                    if self._stream_parse(response.content_length):
+                        data, content_hash = await self._async_parse_stream(response)
+                    else:
+                        body = await response.read()
+                        self._record_bytes(len(body))
+                        content_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+                    self._payload_size = self.stats["bytes"]
+                    if self._is_unchanged(content_hash):
+                        return self.data
+                    if body is not None:
+                        data = await self._async_parse_body(body)
+                    self._content_hash = content_hash
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as err:
+            raise _RetryableError(repr(err)) from err
+        finally:
+            # Durata totală a cererii (inclusiv descărcarea și parsarea).
+            self.stats["fetch_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+        self.stats["changed"] += 1
+        return data
+
+    def _record_bytes(self, size):
+        self.stats["bytes"] += size
+        self.stats["bytes_total"] += size
+
+    def _decode(self, body):
+        """Decodare + normalizare; rulează pe event loop sau în executor."""
+        if self.data_format == "xml":
+            return prepare_avertizari_model(parse_avertizari_xml(body))
+        return json_loads(body)
+
+    async def _async_parse_body(self, body):
+        """Peste `EXECUTOR_PARSE_THRESHOLD`, decodarea se face în executor."""
+        start = time.perf_counter()
+        if len(body) >= EXECUTOR_PARSE_THRESHOLD:
+            data = await self.hass.async_add_executor_job(self._decode, body)
+            self._record_parse(start, 0.0, offloaded=True)
+        else:
+            data = self._decode(body)
+            self._record_parse(start, time.perf_counter() - start)
+        return data
+
+    async def _async_parse_stream(self, response):
+        """Parsare incrementală pe event loop; după prag, restul corpului este
+        citit în memorie și parsat printr-un singur apel în executor."""
+        start = time.perf_counter()
+        loop_time = 0.0
+        received = 0
+        offload = (response.content_length or 0) >= EXECUTOR_PARSE_THRESHOLD
+        rest = []
+        hasher = hashlib.blake2b(digest_size=16)
+        parser = AvertizariXmlParser()
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            received += len(chunk)
+            self._record_bytes(len(chunk))
+            offload = offload or received >= EXECUTOR_PARSE_THRESHOLD
+            if offload:
+                rest.append(chunk)
+            else:
+                chunk_start = time.perf_counter()
+                hasher.update(chunk)
+                parser.feed(chunk)
+                loop_time += time.perf_counter() - chunk_start
+        if offload:
+            data = await self.hass.async_add_executor_job(self._finish_parse, parser, hasher, b"".join(rest))
+        else:
+            close_start = time.perf_counter()
+            data = self._finish_parse(parser, hasher)
+            loop_time += time.perf_counter() - close_start
+        self._record_parse(start, loop_time, offloaded=offload)
+        return data, hasher.hexdigest()
+
+    @staticmethod
+    def _finish_parse(parser, hasher, rest=b""):
+        if rest:
+            hasher.update(rest)
+            parser.feed(rest)
+        return prepare_avertizari_model(parser.close())
+
+    def _record_parse(self, start, loop_time, offloaded=False):
+        parse_ms = round((time.perf_counter() - start) * 1000, 1)
+        loop_ms = round(loop_time * 1000, 1)
+        self.stats["parse_ms"] = parse_ms
+        self.stats["loop_block_ms"] = loop_ms
+        if offloaded:
+            self.stats["executor_parses"] += 1
+        _LOGGER.debug(
+            "Feed ANM %s parsat în %.1f ms (%.1f ms pe event loop%s)",
+            self.url, parse_ms, loop_ms, ", executor" if offloaded else "",
+        )
@@ -0,0 +1,95 @@
+"""Fișierele frontend (card + hartă) servite direct din integrare.
+
+Fișierele nu mai sunt copiate în /config/www: sunt înregistrate ca căi
+statice cu antete de cache de lungă durată, iar resursa Lovelace are în URL
+hash-ul conținutului, deci browserele le cer din nou doar după o actualizare.
+Harta nu este inclusă în integrare; dacă lipsește, este servită copia din
+/config/www, iar fără niciuna cardul o caută la /local/anm-harta.svg.
+"""
+import hashlib
+import logging
+import os
+
+_LOGGER = logging.getLogger(__name__)
+
+URL_BASE = "/meteo_anm"
+CARD_FILE = "anm-map-card.js"
+MAP_FILE = "anm-harta.svg"
+# Resursa din versiunile care copiau cardul în /config/www.
+LEGACY_CARD_URL = f"/local/{CARD_FILE}"
+
+
+def map_svg_path(hass):
+    """Harta folosită de card: cea inclusă în integrare sau, dacă lipsește,
+    copia din /config/www; None dacă nu există niciuna. Rulează în executor.
+    """
+    for path in (os.path.join(os.path.dirname(__file__), MAP_FILE), hass.config.path("www", MAP_FILE)):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _assets_version(paths):
+    """Hash-ul comun al fișierelor servite (cardul îl folosește și pentru SVG)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        try:
+            with open(path, "rb") as file:
+                digest.update(file.read())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+async def async_register_frontend(hass):
+    """Căile statice și resursa Lovelace; rulează o dată, în `async_setup`."""
+    if getattr(hass, "http", None) is None:
+        return
+    paths = [(f"{URL_BASE}/{CARD_FILE}", os.path.join(os.path.dirname(__file__), CARD_FILE))]
+    svg_path = await hass.async_add_executor_job(map_svg_path, hass)
+    if svg_path is None:
+        _LOGGER.debug("Harta %s lipsește; cardul o caută la /local/%s", MAP_FILE, MAP_FILE)
+    else:
+        paths.append((f"{URL_BASE}/{MAP_FILE}", svg_path))
+    try:
+        from homeassistant.components.http import StaticPathConfig
+
+        await hass.http.async_register_static_paths(
+            [StaticPathConfig(url, path, cache_headers=True) for url, path in paths]
+        )
+    except ImportError:
+        for url, path in paths:
+            hass.http.register_static_path(url, path, cache_headers=True)
+
+    version = await hass.async_add_executor_job(_assets_version, [path for _, path in paths])
+    await _async_register_resource(hass, f"{URL_BASE}/{CARD_FILE}?v={version}")
+
+
+async def _async_register_resource(hass, url):
+    """Adaugă/actualizează resursa cardului (doar în modul Lovelace „storage”)."""
+    lovelace = hass.data.get("lovelace")
+    resources = getattr(lovelace, "resources", None)
+    if resources is None and isinstance(lovelace, dict):
+        resources = lovelace.get("resources")
+    if resources is None or not hasattr(resources, "async_create_item"):
+        _LOGGER.debug("Resursele Lovelace sunt în YAML; adăugați manual %s", url)
+        return
+    if not getattr(resources, "loaded", True):
+        await resources.async_load()
+        resources.loaded = True
+
+    path = url.split("?", 1)[0]
+    found = False
+    for item in list(resources.async_items()):
+        item_path = item["url"].split("?", 1)[0]
+        if item_path not in (path, LEGACY_CARD_URL):
+            continue
+        if found:
+            # Aceeași resursă de două ori ar defini cardul de două ori.
+            await resources.async_delete_item(item["id"])
+            continue
+        found = True
+        if item["url"] != url:
+            await resources.async_update_item(item["id"], {"res_type": "module", "url": url})
+    if not found:
+        await resources.async_create_item({"res_type": "module", "url": url})
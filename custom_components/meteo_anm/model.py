@@ -0,0 +1,167 @@
+"""Modelul intern comun parserelor ANM, independent de entitățile HA.
+
+Fiecare payload este transformat o singură dată în aceste obiecte compacte
+(`__slots__`, fără dicționar per instanță), comune tuturor intrărilor.
+Obiectele nu pot fi modificate după construire; atributele senzorilor sunt
+construite din ele doar pentru ce expune fiecare entitate (`as_dict` sau
+builder-ele din parsing.py).
+"""
+
+
+class _Record:
+    """Egalitate, hash și reprezentare după `_fields`; imuabil după `__init__`."""
+
+    __slots__ = ()
+    _fields = ()
+
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} nu poate fi modificat")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} nu poate fi modificat")
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other._values() == self._values()
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class Zone(_Record):
+    """O <zona> a unei avertizări XML (ex. zonă montană `CJ_1`)."""
+
+    __slots__ = ("cod", "culoare", "geometry")
+    _fields = __slots__
+    tag = "zona"
+
+    def __init__(self, cod, culoare, geometry=None):
+        self._set(cod=cod, culoare=culoare, geometry=geometry)
+
+    @property
+    def judet(self):
+        """Codul județului din care face parte zona."""
+        return self.cod.split("_", 1)[0]
+
+    def as_dict(self):
+        return {"cod": self.cod, "culoare": self.culoare}
+
+
+class CountyAlert(_Record):
+    """Un <judet> al unei avertizări (XML sau avertizari-generale).
+
+    `use_coord_gis` / `coord_gis` păstrează textul original doar pentru
+    avertizari-generale, care îl expune; pentru XML conturul există doar
+    ca `geometry`.
+    """
+
+    __slots__ = ("cod", "culoare", "geometry", "use_coord_gis", "coord_gis")
+    _fields = __slots__
+    tag = "judet"
+
+    def __init__(self, cod, culoare, geometry=None, use_coord_gis=None, coord_gis=None):
+        self._set(cod=cod, culoare=culoare, geometry=geometry, use_coord_gis=use_coord_gis, coord_gis=coord_gis)
+
+
+class Alert(_Record):
+    """O <avertizare>: atributele comune și județele/zonele ei.
+
+    `elemente` păstrează județele și zonele în ordinea din feed (harta),
+    `judete_index` grupează județele după cod, iar `zone_index` zonele după
+    codul județului.
+    """
+
+    # Indecșii sunt derivați din `elemente`, deci nu intră în `_fields`.
+    _fields = (
+        "tip_mesaj", "culoare", "data_aparitiei", "data_expirarii", "intervalul",
+        "fenomene_vizate", "mesaj", "zona_afectata", "inceput", "sfarsit", "elemente",
+    )
+    __slots__ = _fields + ("judete", "zone", "judete_index", "zone_index")
+
+    def __init__(
+        self, tip_mesaj=None, culoare=None, data_aparitiei=None, data_expirarii=None,
+        intervalul=None, fenomene_vizate=None, mesaj=None, zona_afectata=None,
+        inceput=None, sfarsit=None, elemente=(),
+    ):
+        elemente = tuple(elemente)
+        judete = tuple(e for e in elemente if e.tag == "judet")
+        zone = tuple(e for e in elemente if e.tag == "zona")
+        judete_index = {}
+        for judet in judete:
+            judete_index.setdefault(judet.cod, []).append(judet)
+        zone_index = {}
+        for zona in zone:
+            if zona.cod:
+                zone_index.setdefault(zona.judet, []).append(zona)
+        self._set(
+            tip_mesaj=tip_mesaj, culoare=culoare, data_aparitiei=data_aparitiei,
+            data_expirarii=data_expirarii, intervalul=intervalul, fenomene_vizate=fenomene_vizate,
+            mesaj=mesaj, zona_afectata=zona_afectata, inceput=inceput, sfarsit=sfarsit,
+            elemente=elemente, judete=judete, zone=zone,
+            judete_index={cod: tuple(items) for cod, items in judete_index.items()},
+            zone_index={cod: tuple(items) for cod, items in zone_index.items()},
+        )
+
+
+class Station(_Record):
+    """O stație din starea-vremii, în forma expusă de senzor."""
+
+    __slots__ = (
+        "nume", "temperatura", "umiditate", "presiune", "nebulozitate",
+        "fenomene", "zapada", "tempapa", "vant", "last_update",
+    )
+    _fields = __slots__
+
+    def __init__(self, nume, temperatura=None, umiditate=None, presiune=None, nebulozitate=None,
+                 fenomene=None, zapada=None, tempapa=None, vant=None, last_update=None):
+        self._set(
+            nume=nume, temperatura=temperatura, umiditate=umiditate, presiune=presiune,
+            nebulozitate=nebulozitate, fenomene=fenomene, zapada=zapada, tempapa=tempapa,
+            vant=vant, last_update=last_update,
+        )
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+
+class ForecastDay(_Record):
+    """O zi din prognoza unui oraș."""
+
+    __slots__ = ("data", "temp_min", "temp_max", "fenomen_descriere", "fenomen_simbol")
+    _fields = __slots__
+
+    def __init__(self, data, temp_min=None, temp_max=None, fenomen_descriere=None, fenomen_simbol=None):
+        self._set(
+            data=data, temp_min=temp_min, temp_max=temp_max,
+            fenomen_descriere=fenomen_descriere, fenomen_simbol=fenomen_simbol,
+        )
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+
+class CityForecast(_Record):
+    """Un oraș din prognoza-orase, cu zilele de prognoză."""
+
+    __slots__ = ("nume", "data_prognozei", "prognoza")
+    _fields = __slots__
+
+    def __init__(self, nume, data_prognozei=None, prognoza=()):
+        self._set(nume=nume, data_prognozei=data_prognozei, prognoza=tuple(prognoza))
+
+    def as_dict(self):
+        return {
+            "nume": self.nume,
+            "data_prognozei": self.data_prognozei,
+            "prognoza": [zi.as_dict() for zi in self.prognoza],
+        }
@@ -0,0 +1,1282 @@
+"""Parsare comună a payload-urilor ANM, independentă de entitățile HA."""
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from functools import lru_cache
+import base64
+import hashlib
+import html
+import json
+import math
+import re
+import sys
+import unicodedata
+import xml.etree.ElementTree as ET
+
+from .model import Alert, CityForecast, CountyAlert, ForecastDay, Station, Zone
+from .static_config import COORDONATE_ORASE
+
+# Crește când forma modelului salvat (`dump_avertizari_model`) se schimbă.
+AVERTIZARI_MODEL_VERSION = 3
+
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+# Corectăm separări artificiale apărute din HTML (ex: AT ENȚIONARE)
+_AT_EN_RE = re.compile(r"\bAT\s+EN([ȚȚŢT])", re.IGNORECASE)
+
+
+def clean_html(value):
+    """Textul simplu al unui mesaj HTML ANM.
+
+    Același mesaj apare în mai multe avertizări, senzori și intrări și la
+    fiecare interogare; rezultatul este memorat (LRU, cheie = hash-ul
+    textului), deci un mesaj neschimbat costă doar o căutare în dicționar.
+    """
+    if not isinstance(value, str):
+        return value
+    return _clean_html_cached(value)
+
+
+@lru_cache(maxsize=128)
+def _clean_html_cached(value):
+    text = html.unescape(value)
+    text = _HTML_TAG_RE.sub(" ", text)
+    text = " ".join(text.split())
+    return _AT_EN_RE.sub(r"ATEN\1", text)
+
+
+# Mesajele complete pentru modul cu atribute compacte: senzorii expun doar
+# hash-ul, iar textul se obține la cerere (serviciul meteo_anm.get_message).
+_MESSAGES = OrderedDict()
+_MESSAGES_MAX = 256
+
+
+def message_hash(value):
+    """Hash scurt și stabil al mesajului curățat; textul rămâne disponibil prin `get_message`.
+
+    Fiecare apel mută mesajul la capătul LRU-ului `_MESSAGES`, deci un hash
+    încă publicat de senzori nu este eliminat.
+    """
+    text = clean_html(value)
+    if not text:
+        return None
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+    if digest in _MESSAGES:
+        _MESSAGES.move_to_end(digest)
+        return digest
+    _MESSAGES[digest] = text
+    if len(_MESSAGES) > _MESSAGES_MAX:
+        _MESSAGES.popitem(last=False)
+    return digest
+
+
+def get_message(digest):
+    """Textul complet al unui mesaj expus în atribute doar prin hash."""
+    return _MESSAGES.get(digest)
+
+
+def normalize(text):
+    """Majuscule fără diacritice, pentru potriviri de nume (județ, localitate)."""
+    if not isinstance(text, str):
+        return ""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().upper()
+
+
+def parse_localitati(value):
+    """Lista localităților unei intrări: text separat prin virgulă sau listă.
+
+    Fiecare element poate avea excluderi ('CONSTANTA !DIG'); duplicatele
+    (același `locality_slug`, deci și același unique_id) sunt eliminate,
+    ordinea se păstrează.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    localitati = []
+    seen = set()
+    for item in value or []:
+        item = " ".join(str(item).split())
+        key = locality_slug(item)
+        if item and key not in seen:
+            seen.add(key)
+            localitati.append(item)
+    return localitati
+
+
+def locality_slug(localitate):
+    """Sufix stabil pentru unique_id: 'Constanța !Dig' -> 'constanta_not_dig'.
+
+    Excluderile rămân distincte de termenii obișnuiți: 'Bucuresti Filaret'
+    -> 'bucuresti_filaret'.
+    """
+    return "_".join(normalize(localitate).replace("!", " NOT ").lower().split())
+
+
+class LocalityPattern:
+    """Filtrul `localitate` al unei intrări, compilat o singură dată.
+
+    Primul termen trebuie să apară în nume, termenii precedați de `!` nu:
+    ex. 'CONSTANTA !DIG'. Comparația nu ține cont de diacritice.
+    """
+
+    __slots__ = ("include", "excludes", "key")
+
+    def __init__(self, pattern):
+        tokens = [normalize(t).strip() for t in (pattern or "").split("!")]
+        tokens = [t for t in tokens if t]
+        self.include = tokens[0] if tokens else ""
+        self.excludes = tuple(tokens[1:])
+        self.key = (self.include, self.excludes)
+
+    def __bool__(self):
+        return bool(self.include)
+
+    def matches(self, name):
+        """`name` trebuie să fie deja normalizat (vezi `normalize`)."""
+        return self.include in name and not any(ex in name for ex in self.excludes)
+
+
+_COORDINATES_RE = re.compile(r"^@\s*(-?\d+(?:\.\d+)?)\s*[\s;/]\s*(-?\d+(?:\.\d+)?)$")
+_HOME = frozenset(("", "HOME", "ACASA"))
+
+
+def locality_coordinates(localitate, home=None):
+    """(lat, lon) pentru o localitate dată prin coordonate, altfel None.
+
+    '@44.43 26.10' (sau '@44.43;26.10') sunt coordonate explicite; '@',
+    '@acasa' și '@home' înseamnă `home` (coordonatele Home Assistant).
+    """
+    text = " ".join(str(localitate or "").split())
+    if not text.startswith("@"):
+        return None
+    if normalize(text[1:]).strip() in _HOME:
+        return tuple(home) if home and None not in home else None
+    match = _COORDINATES_RE.match(text)
+    if not match:
+        return None
+    lat, lon = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return lat, lon
+
+
+_EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE = math.pi * _EARTH_RADIUS_KM / 180
+_MERCATOR_RADIUS = 6378137.0
+
+
+def mercator_to_lat_lon(x, y):
+    """Coordonate EPSG:3857 (metri) -> (lat, lon) în grade."""
+    lon = math.degrees(x / _MERCATOR_RADIUS)
+    lat = math.degrees(2 * math.atan(math.exp(y / _MERCATOR_RADIUS)) - math.pi / 2)
+    return lat, lon
+
+
+def lat_lon_to_mercator(lat, lon):
+    """(lat, lon) în grade -> coordonate EPSG:3857 (metri), ca în `coordGis`."""
+    x = _MERCATOR_RADIUS * math.radians(lon)
+    y = _MERCATOR_RADIUS * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+    return x, y
+
+
+def _ring_bbox(ring):
+    xs, ys = ring[0::2], ring[1::2]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _in_bbox(bbox, x, y):
+    return bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]
+
+
+def _ring_contains(ring, x, y):
+    """Ray casting pe un inel cu coordonatele x, y alternate."""
+    inside = False
+    x1, y1 = ring[-2], ring[-1]
+    points = iter(ring)
+    for x2, y2 in zip(points, points):
+        if (y2 > y) != (y1 > y) and x < (x1 - x2) * (y - y2) / (y1 - y2) + x2:
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+class MultiPolygon:
+    """Poligoanele unui `coordGis` (WKT, EPSG:3857) în formă compactă.
+
+    Fiecare inel este un `array('f')` cu coordonatele x, y alternate (float32,
+    precizie sub un metru la aceste valori). Obiectul și fiecare poligon au
+    bbox-ul precalculat, deci un punct din afara lor este respins fără a
+    parcurge vreun inel; altfel se face ray casting pe conturul exterior și
+    pe găuri.
+    """
+
+    __slots__ = ("bbox", "polygons")
+
+    def __init__(self, polygons):
+        # polygons: [(contur exterior, [găuri])]
+        self.polygons = tuple(
+            (_ring_bbox(outer), outer, tuple(holes)) for outer, holes in polygons
+        )
+        boxes = [bbox for bbox, _outer, _holes in self.polygons]
+        self.bbox = (
+            min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes),
+        ) if boxes else None
+
+    def __bool__(self):
+        return bool(self.polygons)
+
+    def __eq__(self, other):
+        return isinstance(other, MultiPolygon) and self.polygons == other.polygons
+
+    def __hash__(self):
+        # Inelele (`array`) nu au hash; poligoanele egale au același bbox.
+        return hash(self.bbox)
+
+    def contains(self, x, y):
+        """Punctul (x, y) în EPSG:3857 este în interiorul unui poligon."""
+        if self.bbox is None or not _in_bbox(self.bbox, x, y):
+            return False
+        for bbox, outer, holes in self.polygons:
+            if (
+                _in_bbox(bbox, x, y)
+                and _ring_contains(outer, x, y)
+                and not any(_ring_contains(hole, x, y) for hole in holes)
+            ):
+                return True
+        return False
+
+    def dump(self):
+        """Forma serializabilă JSON: inelele ca base64 (float32, little endian)."""
+        return [
+            [_ring_to_text(outer), *(_ring_to_text(hole) for hole in holes)]
+            for _bbox, outer, holes in self.polygons
+        ]
+
+    @classmethod
+    def load(cls, data):
+        polygons = []
+        for rings in data:
+            rings = [_ring_from_text(ring) for ring in rings]
+            polygons.append((rings[0], rings[1:]))
+        return cls(polygons)
+
+
+def _ring_to_text(ring):
+    if sys.byteorder == "big":
+        ring = array("f", ring)
+        ring.byteswap()
+    return base64.b64encode(ring.tobytes()).decode("ascii")
+
+
+def _ring_from_text(text):
+    ring = array("f")
+    ring.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        ring.byteswap()
+    return ring
+
+
+# Un inel `(x y, x y, ...)`; grupul 1 există doar la primul inel al unui
+# poligon (precedat de încă o paranteză), celelalte sunt găuri.
+_WKT_RING_RE = re.compile(r"(\(\s*)?\(([^()]*)\)")
+
+
+@lru_cache(maxsize=256)
+def parse_wkt_polygons(text):
+    """`MultiPolygon` dintr-un WKT POLYGON/MULTIPOLYGON, sau None dacă e gol/invalid.
+
+    Memorat: aceleași contururi de județ revin în fiecare payload.
+    """
+    if not isinstance(text, str) or "(" not in text:
+        return None
+    polygons = []
+    try:
+        for match in _WKT_RING_RE.finditer(text):
+            ring = array("f", map(float, match.group(2).replace(",", " ").split()))
+            if len(ring) < 6 or len(ring) % 2:
+                continue
+            if match.group(1) or not polygons:
+                polygons.append((ring, []))
+            else:
+                polygons[-1][1].append(ring)
+    except ValueError:
+        return None
+    return MultiPolygon(polygons) or None
+
+
+def point_lat_lon(geometry):
+    """(lat, lon) al unei geometrii GeoJSON `Point`, în grade sau EPSG:3857."""
+    if not isinstance(geometry, dict) or geometry.get("type") != "Point":
+        return None
+    coordinates = geometry.get("coordinates")
+    try:
+        x, y = float(coordinates[0]), float(coordinates[1])
+    except (TypeError, ValueError, IndexError):
+        return None
+    if abs(x) > 180 or abs(y) > 90:
+        return mercator_to_lat_lon(x, y)
+    return y, x
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Distanța ortodromică (haversine) în km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# Distanța maximă până la stația / orașul găsit după coordonate; orașele din
+# prognoza-orase (reședințele de județ) sunt mai rare decât stațiile.
+STATION_MAX_KM = 50
+CITY_MAX_KM = 100
+
+
+class GridIndex:
+    """Puncte (lat, lon) grupate într-o grilă de celule de `cell` grade.
+
+    Cel mai apropiat punct se caută în inele de celule în jurul celulei
+    interogate, oprindu-ne când niciun inel următor nu mai poate conține un
+    punct mai apropiat; un punct din afara grilei (ex. în alt continent) este
+    comparat direct cu toate punctele. Rezultatul este memorat per coordonate.
+    """
+
+    __slots__ = ("_cell", "_cells", "_bbox", "_nearest")
+
+    def __init__(self, points=(), cell=0.5):
+        self._cell = cell
+        self._cells = {}
+        self._nearest = {}
+        for lat, lon, item in points:
+            self._cells.setdefault(self._key(lat, lon), []).append((lat, lon, item))
+        rows = [row for row, _col in self._cells]
+        cols = [col for _row, col in self._cells]
+        self._bbox = (min(rows), min(cols), max(rows), max(cols)) if self._cells else None
+
+    def __len__(self):
+        return sum(len(points) for points in self._cells.values())
+
+    def _key(self, lat, lon):
+        return math.floor(lat / self._cell), math.floor(lon / self._cell)
+
+    def nearest(self, lat, lon, max_km=None):
+        """(element, distanța în km) pentru punctul cel mai apropiat, sau None.
+
+        Cu `max_km`, un punct mai îndepărtat de atât nu este întors.
+        """
+        key = (round(lat, 5), round(lon, 5))
+        try:
+            result = self._nearest[key]
+        except KeyError:
+            result = self._search(lat, lon) if self._cells else None
+            if len(self._nearest) >= 256:
+                self._nearest.clear()
+            self._nearest[key] = result
+        if result is not None and max_km is not None and result[1] > max_km:
+            return None
+        return result
+
+    def _search(self, lat, lon):
+        row, col = self._key(lat, lon)
+        if not _in_bbox(self._bbox, row, col):
+            return self._scan(lat, lon, (p for points in self._cells.values() for p in points))
+        # În grilă, cel mult câteva zeci de inele (dimensiunea țării).
+        max_ring = max(max(abs(r - row), abs(c - col)) for r, c in self._cells)
+        best = None
+        best_km = math.inf
+        for ring in range(max_ring + 1):
+            for r in range(row - ring, row + ring + 1):
+                edge = abs(r - row) == ring
+                for c in range(col - ring, col + ring + 1) if edge else (col - ring, col + ring):
+                    for p_lat, p_lon, item in self._cells.get((r, c), ()):
+                        km = distance_km(lat, lon, p_lat, p_lon)
+                        if km < best_km:
+                            best, best_km = item, km
+            # Punctele din inelele următoare sunt la cel puțin `ring` celule
+            # distanță (pe longitudine, gradul se scurtează cu cos(lat)).
+            far_lat = min(89.9, abs(lat) + (ring + 1) * self._cell)
+            if best is not None and best_km <= ring * self._cell * _KM_PER_DEGREE * math.cos(math.radians(far_lat)):
+                break
+        return (best, round(best_km, 2)) if best is not None else None
+
+    @staticmethod
+    def _scan(lat, lon, points):
+        best = None
+        best_km = math.inf
+        for p_lat, p_lon, item in points:
+            km = distance_km(lat, lon, p_lat, p_lon)
+            if km < best_km:
+                best, best_km = item, km
+        return (best, round(best_km, 2)) if best is not None else None
+
+
+class LocalityIndex:
+    """Înregistrările unui payload indexate după numele normalizat al localității.
+
+    Construit o dată per payload și comun tuturor intrărilor: o potrivire
+    exactă este o căutare în dicționar; altfel se parcurg doar numele deja
+    normalizate. Rezultatul fiecărui tipar este memorat, deci intrările cu
+    aceeași localitate nu mai caută din nou. Înregistrările cu coordonate
+    (`points`: lat, lon, înregistrare) pot fi găsite și cu `nearest`.
+    """
+
+    __slots__ = ("_names", "_by_name", "_matches", "_grid", "_max_km")
+
+    def __init__(self, records=(), points=(), max_km=None):
+        self._names = []
+        self._by_name = {}
+        self._matches = {}
+        self._grid = GridIndex(points)
+        self._max_km = max_km
+        for nume, record in records:
+            key = normalize(nume)
+            if key:
+                self._names.append((key, record))
+                self._by_name[key] = record
+
+    def __len__(self):
+        return len(self._names)
+
+    def nearest(self, lat, lon):
+        """(înregistrare, distanța în km) cea mai apropiată de (lat, lon).
+
+        None dacă nu există nicio înregistrare la cel mult `max_km` (ex.
+        coordonate din afara României).
+        """
+        return self._grid.nearest(lat, lon, self._max_km)
+
+    def find(self, pattern):
+        """Înregistrarea potrivită de `pattern` (`LocalityPattern`) sau None.
+
+        Numele identic are prioritate; altfel, ca înainte, câștigă ultima
+        localitate din feed care conține termenul căutat.
+        """
+        if not pattern:
+            return None
+        try:
+            return self._matches[pattern.key]
+        except KeyError:
+            pass
+        record = self._by_name.get(pattern.include)
+        if record is None or not pattern.matches(pattern.include):
+            record = None
+            for name, candidate in self._names:
+                if pattern.matches(name):
+                    record = candidate
+        self._matches[pattern.key] = record
+        return record
+
+
+def index_starea_vremii(data):
+    """Indexul stațiilor din starea-vremii (`Station`)."""
+    features = data.get("features") if isinstance(data, dict) else None
+    if not isinstance(features, list):
+        return LocalityIndex()
+    records = []
+    points = []
+    for feature in features:
+        properties = (feature.get("properties") if isinstance(feature, dict) else None) or {}
+        nume = properties.get("nume")
+        if not isinstance(nume, str):
+            continue
+        actualizat = properties.get("actualizat")
+        record = Station(
+            nume,
+            temperatura=properties.get("tempe"),
+            umiditate=properties.get("umezeala"),
+            presiune=properties.get("presiunetext"),
+            nebulozitate=properties.get("nebulozitate"),
+            fenomene=properties.get("fenomen_e"),
+            zapada=properties.get("zapada"),
+            tempapa=properties.get("tempapa"),
+            vant=properties.get("vant"),
+            last_update=actualizat.replace("&nbsp;", " ") if isinstance(actualizat, str) else actualizat,
+        )
+        records.append((nume, record))
+        lat_lon = point_lat_lon(feature.get("geometry"))
+        if lat_lon is not None:
+            points.append((*lat_lon, record))
+    return LocalityIndex(records, points, STATION_MAX_KM)
+
+
+def _city_key(nume):
+    return " ".join(normalize(nume).replace("-", " ").split())
+
+
+_CITY_COORDINATES = {_city_key(nume): lat_lon for nume, lat_lon in COORDONATE_ORASE.items()}
+
+
+def city_coordinates(nume):
+    """Coordonatele unui oraș din prognoza-orase (`COORDONATE_ORASE`), sau None.
+
+    Numele poate fi și forma scurtă: 'Cluj' pentru 'Cluj-Napoca'.
+    """
+    key = _city_key(nume)
+    if not key:
+        return None
+    lat_lon = _CITY_COORDINATES.get(key)
+    if lat_lon is None:
+        for city, candidate in _CITY_COORDINATES.items():
+            if city.startswith(key + " "):
+                return candidate
+    return lat_lon
+
+
+def index_prognoza_orase(data):
+    """Indexul orașelor din prognoza-orase (`CityForecast`, cu toate zilele de prognoză)."""
+    tara = (data.get("tara") if isinstance(data, dict) else None) or {}
+    localitati = tara.get("localitate", []) if isinstance(tara, dict) else []
+    if isinstance(localitati, dict):
+        localitati = [localitati]
+    if not isinstance(localitati, list):
+        return LocalityIndex()
+    records = []
+    points = []
+    for loc in localitati:
+        if not isinstance(loc, dict):
+            continue
+        nume_loc = (loc.get("@attributes", {}) or {}).get("nume")
+        if not isinstance(nume_loc, str):
+            continue
+        prognoze = loc.get("prognoza", [])
+        if isinstance(prognoze, dict):
+            prognoze = [prognoze]
+        zile = []
+        for prog in prognoze or []:
+            if not isinstance(prog, dict):
+                continue
+            prog_attrs = prog.get("@attributes", {}) or {}
+            zile.append(ForecastDay(
+                prog_attrs.get("data"),
+                temp_min=prog.get("temp_min"),
+                temp_max=prog.get("temp_max"),
+                fenomen_descriere=prog.get("fenomen_descriere"),
+                fenomen_simbol=prog.get("fenomen_simbol"),
+            ))
+        record = CityForecast(nume_loc, data_prognozei=loc.get("DataPrognozei"), prognoza=zile)
+        records.append((nume_loc, record))
+        lat_lon = city_coordinates(nume_loc)
+        if lat_lon is not None:
+            points.append((*lat_lon, record))
+    return LocalityIndex(records, points, CITY_MAX_KM)
+
+
+_SEGMENT_SPLIT_RE = re.compile(r"[,;:.()\n]+")
+_DASH_RE = re.compile(r"[-\u2010-\u2015]")
+_WORD_RE = re.compile(r"[A-Z0-9]+")
+
+
+def _zone_key(text):
+    """Forma comparabilă a unui nume: fără diacritice, cratimele devin spații."""
+    return " ".join(normalize(_DASH_RE.sub(" ", text or "")).split())
+
+
+def zone_tokens(zona):
+    """Tokenii normalizați ai unei zone nowcasting, calculați o singură dată.
+
+    Conțin segmentele textului (separate prin virgulă, punct și virgulă,
+    două puncte), fiecare cuvânt și grupurile de două sau trei cuvinte
+    consecutive, ca 'SATU MARE' sau 'CARAS SEVERIN' să fie găsite printr-o
+    simplă verificare de apartenență. Cratimele sunt tratate ca spații (vezi
+    `_zone_key`), deci 'Bistrița-Năsăud' și 'Bistrita Nasaud' se potrivesc.
+    """
+    tokens = set()
+    for segment in _SEGMENT_SPLIT_RE.split(_zone_key(zona)):
+        segment = segment.strip()
+        if not segment:
+            continue
+        tokens.add(segment)
+        words = _WORD_RE.findall(segment)
+        tokens.update(words)
+        tokens.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        tokens.update(f"{a} {b} {c}" for a, b, c in zip(words, words[1:], words[2:]))
+    return frozenset(tokens)
+
+
+class NowcastingIndex:
+    """Avertizările nowcasting ale unui payload, indexate după tokenii zonei.
+
+    Construit o dată per payload și comun tuturor intrărilor; o intrare
+    obține avertizările județului printr-o căutare în dicționar. Intervalul
+    fiecărei avertizări (`dataInceput`/`dataSfarsit`) este citit tot aici.
+    """
+
+    __slots__ = ("avertizari", "_by_token", "_windows")
+
+    def __init__(self, avertizari=()):
+        self.avertizari = []
+        self._by_token = {}
+        self._windows = {}
+        for entry, tokens in avertizari:
+            self.avertizari.append(entry)
+            self._windows[id(entry)] = (
+                parse_anm_datetime(entry.get("data_inceput")),
+                parse_anm_datetime(entry.get("data_sfarsit")),
+            )
+            for token in tokens:
+                self._by_token.setdefault(token, []).append(entry)
+
+    def __len__(self):
+        return len(self.avertizari)
+
+    def find(self, name):
+        """Avertizările (în ordinea din feed) a căror zonă conține `name` (județ sau localitate)."""
+        return self._by_token.get(_zone_key(name), [])
+
+    def window(self, entry):
+        """`(inceput, sfarsit)` ale unei avertizări întoarse de `find`."""
+        return self._windows.get(id(entry), (None, None))
+
+
+def index_avertizari_nowcasting(data):
+    """Indexul avertizărilor nowcasting; `avertizare` poate fi un dict sau o listă."""
+    avertizare = data.get("avertizare") if isinstance(data, dict) else None
+    if isinstance(avertizare, dict):
+        avertizare = [avertizare]
+    if not isinstance(avertizare, list):
+        return NowcastingIndex()
+    avertizari = []
+    for item in avertizare:
+        if not isinstance(item, dict):
+            continue
+        attrs = item.get("@attributes", {}) or {}
+        entry = {
+            "tip_mesaj": attrs.get("numeTipMesaj") or attrs.get("tipMesaj"),
+            "data_inceput": attrs.get("dataInceput"),
+            "data_sfarsit": attrs.get("dataSfarsit"),
+            "zona": attrs.get("zona"),
+            "semnalare": attrs.get("semnalare"),
+            "culoare": attrs.get("numeCuloare") or attrs.get("culoare"),
+            "modificat": attrs.get("modificat"),
+            "creat": attrs.get("creat"),
+        }
+        avertizari.append((entry, zone_tokens(attrs.get("zona") or "")))
+    return NowcastingIndex(avertizari)
+
+
+def state_timestamp(now=None):
+    """Starea senzorilor: momentul construirii, în UTC ('2026-01-20 10:00:00.123456')."""
+    return (now or datetime.now(timezone.utc)).replace(tzinfo=None).isoformat(" ")
+
+
+def attributes_hash(attributes):
+    """Hash stabil al atributelor unui senzor, pentru detectarea schimbărilor."""
+    encoded = json.dumps(attributes, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Datele din feed-urile ANM sunt în ora României, fără fus orar.
+ANM_TIME_ZONE = ZoneInfo("Europe/Bucharest")
+
+_LUNI = {
+    "IANUARIE": 1, "FEBRUARIE": 2, "MARTIE": 3, "APRILIE": 4, "MAI": 5, "IUNIE": 6,
+    "IULIE": 7, "AUGUST": 8, "SEPTEMBRIE": 9, "OCTOMBRIE": 10, "NOIEMBRIE": 11, "DECEMBRIE": 12,
+}
+_INTERVAL_START_RE = re.compile(r"(\d{1,2})\s+([A-Z]+)\W+ORA\s+(\d{1,2})[:.](\d{2})")
+
+
+def parse_anm_datetime(value):
+    """'2026-01-20T10:00' / '2026-01-20 10:00' -> datetime cu fus orar; None dacă nu se poate."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace(" ", "T", 1))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=ANM_TIME_ZONE)
+
+
+def alert_start(data_aparitiei, intervalul):
+    """Începutul valabilității unei avertizări XML.
+
+    Este primul moment din `intervalul` ('19 ianuarie, ora 20:00 – ...'),
+    cu anul luat din `data_aparitiei`; dacă textul nu poate fi citit,
+    folosim `data_aparitiei`.
+    """
+    aparitie = parse_anm_datetime(data_aparitiei)
+    match = _INTERVAL_START_RE.search(normalize(html.unescape(intervalul or "")))
+    if aparitie is None or match is None or match.group(2) not in _LUNI:
+        return aparitie
+    day, month, hour, minute = int(match.group(1)), _LUNI[match.group(2)], int(match.group(3)), int(match.group(4))
+    year = aparitie.year + (1 if month < aparitie.month else 0)
+    try:
+        return datetime(year, month, day, hour, minute, tzinfo=ANM_TIME_ZONE)
+    except ValueError:
+        return aparitie
+
+
+def alert_window(start, end, now):
+    """`(expirata, activa, următoarea_schimbare)` pentru o alertă cu intervalul [start, end).
+
+    `următoarea_schimbare` este momentul în care alerta începe sau expiră,
+    dacă este în viitor (None altfel).
+    """
+    if end is not None and end <= now:
+        return True, False, None
+    if start is not None and start > now:
+        return False, False, start
+    return False, True, end
+
+
+def _earliest(current, candidate):
+    if candidate is None:
+        return current
+    return candidate if current is None or candidate < current else current
+
+
+# Câmpurile `Alert` salvate de `dump_avertizari_model` (restul sunt derivate).
+_ALERT_FIELDS = (
+    "tip_mesaj", "culoare", "data_aparitiei", "data_expirarii",
+    "intervalul", "fenomene_vizate", "mesaj", "zona_afectata",
+)
+_ELEMENT_TYPES = {"judet": CountyAlert, "zona": Zone}
+
+
+def _alert_fields(attrs):
+    """Câmpurile `Alert` din atributele unei <avertizare> (XML sau JSON)."""
+    return {
+        "tip_mesaj": attrs.get("numeTipMesaj") or attrs.get("tipMesaj"),
+        "culoare": attrs.get("culoare"),
+        "data_aparitiei": attrs.get("dataAparitiei"),
+        "data_expirarii": attrs.get("dataExpirarii"),
+        "intervalul": attrs.get("intervalul"),
+        "fenomene_vizate": attrs.get("fenomeneVizate"),
+        "mesaj": attrs.get("mesaj"),
+        "zona_afectata": attrs.get("zonaAfectata"),
+    }
+
+
+def _new_alert(fields, elemente):
+    return Alert(
+        **fields,
+        inceput=alert_start(fields["data_aparitiei"], fields["intervalul"]),
+        sfarsit=parse_anm_datetime(fields["data_expirarii"]),
+        elemente=elemente,
+    )
+
+
+class AvertizariXmlParser:
+    """Parser incremental pentru avertizari-xml.php.
+
+    Primește documentul pe bucăți (`feed`) și construiește modelul: fiecare
+    <avertizare> devine un `Alert` cu județele (`CountyAlert`) și zonele
+    (`Zone`) în ordinea din feed (folosită de hartă). Codurile sunt deja
+    normalizate, culorile curățate, iar `coordGis` este parsat o singură
+    dată (`MultiPolygon`); restul atributelor voluminoase (`catre`) nu sunt
+    păstrate. Elementul <avertizare> este golit imediat după procesare, deci
+    memoria nu crește cu numărul de avertizări din arbore. Ridică
+    ET.ParseError dacă documentul e invalid.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("end",))
+        self.avertizari = []
+
+    def feed(self, data):
+        self._parser.feed(data)
+        self._read_events()
+
+    def close(self):
+        self._parser.close()
+        self._read_events()
+        return self.avertizari
+
+    def _read_events(self):
+        for _event, elem in self._parser.read_events():
+            if elem.tag != "avertizare":
+                continue
+            elemente = []
+            for child in elem:
+                element_type = _ELEMENT_TYPES.get(child.tag)
+                if element_type is None:
+                    continue
+                geometry = None
+                if child.get("useCoordGis") == "true":
+                    geometry = parse_wkt_polygons(child.get("coordGis"))
+                elemente.append(element_type(
+                    (child.get("cod") or "").upper(),
+                    (child.get("culoare") or "").strip(),
+                    geometry,
+                ))
+            self.avertizari.append(_new_alert(_alert_fields(elem.attrib), elemente))
+            elem.clear()
+
+
+def dump_avertizari_model(model):
+    """Forma compactă, serializabilă JSON, a modelului (fără câmpuri derivate)."""
+    return [
+        {
+            **{name: getattr(avertizare, name) for name in _ALERT_FIELDS},
+            "elemente": [
+                [element.tag, element.cod, element.culoare,
+                 element.geometry.dump() if element.geometry is not None else None]
+                for element in avertizare.elemente
+            ],
+        }
+        for avertizare in model
+    ]
+
+
+def load_avertizari_model(data):
+    """Reconstruiește modelul (inclusiv indecșii) din `dump_avertizari_model`."""
+    return [
+        _new_alert(
+            {name: a.get(name) for name in _ALERT_FIELDS},
+            [
+                _ELEMENT_TYPES[tag](cod, culoare, MultiPolygon.load(geometry) if geometry else None)
+                for tag, cod, culoare, geometry in a["elemente"]
+            ],
+        )
+        for a in data
+    ]
+
+
+def avertizare_contains(avertizare, x, y):
+    """Punctul (x, y), în EPSG:3857, este într-o zonă colorată a avertizării.
+
+    Pentru un județ cu zone care au geometrie (ex. zone montane) se testează
+    doar zonele colorate, nu tot județul. Întoarce None dacă avertizarea nu
+    are geometrii (potrivirea rămâne doar după județ).
+    """
+    geometrii = [element for element in avertizare.elemente if element.geometry is not None]
+    if not geometrii:
+        return None
+    judete_cu_zone = {element.judet for element in geometrii if element.tag == "zona"}
+    for element in geometrii:
+        if not element.culoare or element.culoare == "0":
+            continue
+        if element.tag == "judet" and element.cod in judete_cu_zone:
+            continue
+        if element.geometry.contains(x, y):
+            return True
+    return False
+
+
+def parse_avertizari_xml(text):
+    """Construiește modelul avertizărilor (listă de `Alert`) dintr-un document complet."""
+    parser = AvertizariXmlParser()
+    parser.feed(text)
+    return parser.close()
+
+
+def prepare_avertizari_model(model):
+    """Precalculează textele curățate ale modelului (cache-ul `clean_html`).
+
+    Apelată odată cu parsarea (eventual în executor), astfel încât senzorii
+    construiesc atributele pe event loop doar din căutări în cache.
+    """
+    for avertizare in model:
+        clean_html(avertizare.mesaj)
+        clean_html(avertizare.zona_afectata)
+    return model
+
+
+def build_avertizari_xml(model, judet=None, compact=False, now=None, punct=None):
+    """Avertizările din modelul XML, eventual filtrate după `judet`.
+
+    Returnăm toate avertizările în ordine (așa cum vin în feed) și
+    includem mesajul aferent fiecărui set de județe. Dacă este filtrat
+    după județ, păstrăm doar intrările care îl conțin, iar celelalte
+    județe (și mesajele avertizărilor care nu îl vizează) nu mai sunt
+    construite deloc.
+
+    Cu `compact`, fiecare intrare păstrează doar identificatorii, culorile,
+    intervalele și hash-ul mesajului (vezi `message_hash`).
+
+    Cu `now`, avertizările expirate sunt omise, `activa` arată dacă
+    intervalul a început, iar `_next_change` este următorul moment în care
+    o avertizare inclusă începe sau expiră.
+
+    Cu `punct` (lat, lon), fiecare avertizare are `locatie_afectata` (vezi
+    `avertizare_contains`), iar rezultatul arată dacă vreo avertizare
+    neîncepută sau activă atinge locația.
+    """
+    xy = lat_lon_to_mercator(*punct) if punct else None
+    if compact:
+        return _build_avertizari_xml_compact(model, judet, now, xy)
+
+    avertizari = []
+    next_change = None
+    afectata = None if xy is None else False
+
+    for avertizare in model or []:
+        activa = None
+        if now is not None:
+            expirata, activa, schimbare = alert_window(avertizare.inceput, avertizare.sfarsit, now)
+            if expirata:
+                continue
+        if judet:
+            judete = avertizare.judete_index.get(judet)
+            if not judete:
+                continue
+        else:
+            judete = avertizare.judete
+
+        zone_index = avertizare.zone_index
+        mesaj = clean_html(avertizare.mesaj) if not judet else None
+        zona_afectata = None
+        judete_entries = []
+
+        for element in judete:
+            culoare = element.culoare
+            if not culoare or culoare == "0":
+                continue
+            if mesaj is None:
+                mesaj = clean_html(avertizare.mesaj)
+            if zona_afectata is None:
+                zona_afectata = clean_html(avertizare.zona_afectata)
+            zone = zone_index.get(element.cod)
+            judete_entries.append({
+                "judet": element.cod,
+                "culoare": culoare,
+                "fenomene_vizate": avertizare.fenomene_vizate,
+                "data_expirarii": avertizare.data_expirarii,
+                "data_aparitiei": avertizare.data_aparitiei,
+                "intervalul": avertizare.intervalul,
+                "mesaj": mesaj,
+                "zona_afectata": zona_afectata,
+                "tip_mesaj": avertizare.tip_mesaj,
+                "zone": [zona.as_dict() for zona in zone] if zone else None,
+            })
+
+        if judet and not judete_entries:
+            continue
+        meta = {
+            "tip_mesaj": avertizare.tip_mesaj,
+            "data_aparitiei": avertizare.data_aparitiei,
+            "data_expirarii": avertizare.data_expirarii,
+            "fenomene_vizate": avertizare.fenomene_vizate,
+            "mesaj": mesaj,
+            "culoare": avertizare.culoare,
+        }
+        if now is not None:
+            meta["activa"] = activa
+            next_change = _earliest(next_change, schimbare)
+        if xy is not None:
+            meta["locatie_afectata"] = avertizare_contains(avertizare, *xy)
+            afectata = afectata or bool(meta["locatie_afectata"])
+        avertizari.append({"meta": meta, "judete": judete_entries})
+
+    return _avertizari_result(avertizari, judet, next_change, afectata)
+
+
+def _avertizari_result(avertizari, judet, next_change, afectata=None):
+    if judet and not avertizari:
+        return {}
+    result = {"avertizari": avertizari, "_state": state_timestamp(), "_next_change": next_change}
+    if afectata is not None:
+        result["locatie_afectata"] = afectata
+    return result
+
+
+def _build_avertizari_xml_compact(model, judet=None, now=None, xy=None):
+    avertizari = []
+    next_change = None
+    afectata = None if xy is None else False
+
+    for avertizare in model or []:
+        activa = None
+        if now is not None:
+            expirata, activa, schimbare = alert_window(avertizare.inceput, avertizare.sfarsit, now)
+            if expirata:
+                continue
+        judete = avertizare.judete_index.get(judet) if judet else avertizare.judete
+        if not judete and judet:
+            continue
+
+        zone_index = avertizare.zone_index
+        judete_entries = []
+        for element in judete:
+            culoare = element.culoare
+            if not culoare or culoare == "0":
+                continue
+            zone = zone_index.get(element.cod)
+            judete_entries.append({
+                "judet": element.cod,
+                "culoare": culoare,
+                "zone": [zona.cod for zona in zone] if zone else None,
+            })
+
+        if judet and not judete_entries:
+            continue
+        item = {
+            "tip_mesaj": avertizare.tip_mesaj,
+            "culoare": avertizare.culoare,
+            "data_aparitiei": avertizare.data_aparitiei,
+            "data_expirarii": avertizare.data_expirarii,
+            "intervalul": avertizare.intervalul,
+            "mesaj_hash": message_hash(avertizare.mesaj),
+            "judete": judete_entries,
+        }
+        if now is not None:
+            item["activa"] = activa
+            next_change = _earliest(next_change, schimbare)
+        if xy is not None:
+            item["locatie_afectata"] = avertizare_contains(avertizare, *xy)
+            afectata = afectata or bool(item["locatie_afectata"])
+        avertizari.append(item)
+
+    return _avertizari_result(avertizari, judet, next_change, afectata)
+
+
+_MAP_COLORS = {"1": "yellow", "2": "orange", "3": "red"}
+# Clasele CSS din anm-harta.svg / anm-map-card.js.
+_MAP_CLASSES = {"1": "cod1", "2": "cod2", "3": "cod3"}
+_SVG_SHAPE_ATTRS = ("data-judet", "data-munte", "id")
+_SVG_SHAPE_CLASSES = frozenset(("judet", "munte"))
+_SVG_SEPARATORS_RE = re.compile(r"[_\- ]")
+
+
+class HartaSvgIndex:
+    """Id-urile elementelor din anm-harta.svg indexate după codul ANM.
+
+    Un element este găsit după `data-judet`, `data-munte`, `id` sau clase,
+    ca în card: valoarea întreagă sau sufixul de după un separator (`_`,
+    `-`, spațiu), de exemplu `judet_CJ` pentru `CJ` și `munte-CJ_1` pentru
+    `CJ_1`. Cardul primește harta id → clasă gata calculată, memorată per
+    set de alerte, și nu mai caută în DOM.
+    """
+
+    __slots__ = ("_ids", "_colors")
+
+    def __init__(self, ids=None):
+        self._ids = ids or {}
+        self._colors = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ids(self, cod):
+        return self._ids.get((cod or "").upper(), ())
+
+    def colors(self, shapes):
+        """{id element: clasă CSS} pentru `shapes` din `build_avertizari_harta`."""
+        key = tuple((shape["id"], shape["culoare"]) for shape in shapes)
+        try:
+            return self._colors[key]
+        except KeyError:
+            pass
+        colors = {}
+        for cod, culoare in key:
+            css_class = _MAP_CLASSES.get(culoare, "cod1")
+            for element_id in self.ids(cod):
+                colors[element_id] = css_class
+        if len(self._colors) >= 64:
+            self._colors.clear()
+        self._colors[key] = colors
+        return colors
+
+
+def _svg_keys(value):
+    value = value.strip().upper()
+    if not value:
+        return
+    yield value
+    for match in _SVG_SEPARATORS_RE.finditer(value):
+        suffix = value[match.end():]
+        if suffix:
+            yield suffix
+
+
+def index_harta_svg(source):
+    """`HartaSvgIndex` pentru documentul SVG `source` (bytes).
+
+    Sunt indexate doar elementele cu `id` (cardul le găsește direct) care
+    sunt forme de județ/munte: cu `data-judet`/`data-munte` sau clasa
+    `judet`/`munte`.
+    """
+    ids = {}
+    for elem in ET.fromstring(source).iter():
+        element_id = elem.get("id")
+        if not element_id:
+            continue
+        classes = (elem.get("class") or "").split()
+        if not (
+            elem.get("data-judet") or elem.get("data-munte")
+            or _SVG_SHAPE_CLASSES.intersection(classes)
+        ):
+            continue
+        values = [elem.get(attr) or "" for attr in _SVG_SHAPE_ATTRS]
+        values.extend(c for c in classes if c not in _SVG_SHAPE_CLASSES)
+        for value in values:
+            for key in _svg_keys(value):
+                element_ids = ids.setdefault(key, [])
+                if element_id not in element_ids:
+                    element_ids.append(element_id)
+    return HartaSvgIndex({key: tuple(element_ids) for key, element_ids in ids.items()})
+
+
+@lru_cache(maxsize=4)
+def load_harta_svg_index(path):
+    """Indexul fișierului SVG de la `path`, sau None dacă lipsește/este invalid."""
+    try:
+        with open(path, "rb") as file:
+            return index_harta_svg(file.read())
+    except (OSError, ET.ParseError):
+        return None
+
+
+def build_avertizari_harta(model, compact=False, now=None, svg_index=None):
+    """Hărțile avertizărilor din modelul XML, în ordinea din feed.
+
+    Pentru fiecare <avertizare> întoarcem lista de zone/județe colorate și
+    mesajul, astfel încât UI-ul să poată afișa cronologic fiecare hartă.
+    Cu `now`, ca în `build_avertizari_xml`, avertizările expirate sunt omise.
+    Cu `svg_index` (`HartaSvgIndex`), fiecare hartă are și `colors`.
+    """
+    maps = []
+    next_change = None
+    for avertizare in model or []:
+        activa = None
+        if now is not None:
+            expirata, activa, schimbare = alert_window(avertizare.inceput, avertizare.sfarsit, now)
+            if expirata:
+                continue
+        shapes = []
+        for element in avertizare.elemente:
+            culoare = element.culoare
+            if not culoare or culoare == "0":
+                continue
+            shapes.append({
+                "id": element.cod.replace("-", "_"),
+                "color": _MAP_COLORS.get(culoare, "green"),
+                "culoare": culoare,
+            })
+        if not shapes:
+            continue
+        meta = {
+            "tip_mesaj": avertizare.tip_mesaj,
+            "data_aparitiei": avertizare.data_aparitiei,
+            "data_expirarii": avertizare.data_expirarii,
+        }
+        if now is not None:
+            meta["activa"] = activa
+            next_change = _earliest(next_change, schimbare)
+        if compact:
+            meta["mesaj_hash"] = message_hash(avertizare.mesaj)
+        else:
+            meta["mesaj"] = clean_html(avertizare.mesaj)
+        harta = {"meta": meta, "shapes": shapes}
+        if svg_index is not None:
+            harta["colors"] = svg_index.colors(shapes)
+        maps.append(harta)
+
+    if not maps:
+        return {}
+    payload = {
+        "maps": maps,
+        "_state": state_timestamp(),
+        "_next_change": next_change,
+    }
+    if not compact:
+        # păstrăm shapes pentru compatibilitate (prima hartă)
+        payload["shapes"] = maps[0]["shapes"]
+    return payload
+
+
+def index_avertizari_generale(data):
+    """Avertizările din avertizari-generale (JSON), ca listă de `Alert`.
+
+    Conturul `coordGis` al fiecărui județ este parsat o singură dată per
+    payload (nu la fiecare construire a atributelor).
+    """
+    avertizare = data.get("avertizare") if isinstance(data, dict) else None
+    if isinstance(avertizare, dict):
+        avertizare = [avertizare]
+    if not isinstance(avertizare, list):
+        return []
+
+    avertizari = []
+    for item in avertizare:
+        if not isinstance(item, dict):
+            continue
+        judete = item.get("judet", [])
+        if isinstance(judete, dict):
+            judete = [judete]
+        elemente = []
+        for j in judete if isinstance(judete, list) else []:
+            if not isinstance(j, dict):
+                continue
+            j_attrs = j.get("@attributes", {}) or {}
+            use_coord_gis = j_attrs.get("useCoordGis")
+            coord_gis = j_attrs.get("coordGis")
+            elemente.append(CountyAlert(
+                (j_attrs.get("cod") or "").upper(),
+                j_attrs.get("culoare"),
+                parse_wkt_polygons(coord_gis) if use_coord_gis == "true" else None,
+                use_coord_gis=use_coord_gis,
+                coord_gis=coord_gis,
+            ))
+        avertizari.append(_new_alert(_alert_fields(item.get("@attributes", {}) or {}), elemente))
+    return avertizari
+
+
+def build_avertizari_generale(avertizari, judet, compact=False, punct=None):
+    """Avertizarea județului `judet` din indexul avertizari-generale.
+
+    Cu `punct` (lat, lon) și `useCoordGis`, `locatie_afectata` arată dacă
+    punctul este în conturul `coordGis` al avertizării.
+    """
+    if not judet or not avertizari:
+        return {}
+
+    match = None
+    match_judet = None
+    for avertizare in avertizari:
+        for element in avertizare.judete_index.get(judet, ()):
+            match_judet = element
+            if compact:
+                match = {
+                    "judet": element.cod,
+                    "culoare": element.culoare,
+                    "data_expirarii": avertizare.data_expirarii,
+                    "data_aparitiei": avertizare.data_aparitiei,
+                    "intervalul": avertizare.intervalul,
+                    "tip_mesaj": avertizare.tip_mesaj,
+                    "culoare_generala": avertizare.culoare,
+                    "mesaj_hash": message_hash(avertizare.zona_afectata),
+                }
+            else:
+                match = {
+                    "judet": element.cod,
+                    "culoare": element.culoare,
+                    "use_coord_gis": element.use_coord_gis,
+                    "coord_gis": element.coord_gis,
+                    "fenomene_vizate": avertizare.fenomene_vizate,
+                    "data_expirarii": avertizare.data_expirarii,
+                    "data_aparitiei": avertizare.data_aparitiei,
+                    "intervalul": avertizare.intervalul,
+                    "mesaj": avertizare.zona_afectata,
+                    "tip_mesaj": avertizare.tip_mesaj,
+                    "culoare_generala": avertizare.culoare,
+                }
+    if match and punct and match_judet.geometry is not None:
+        match["locatie_afectata"] = match_judet.geometry.contains(*lat_lon_to_mercator(*punct))
+    return {"avertizari": [match]} if match else {}
+
+
+def build_avertizari_nowcasting(index, judet_long, now=None):
+    """Avertizările nowcasting neexpirate care menționează județul `judet_long`."""
+    if index is None or not judet_long:
+        return {}
+    avertizari = []
+    next_change = None
+    for entry in index.find(judet_long):
+        if now is None:
+            avertizari.append(entry)
+            continue
+        expirata, activa, schimbare = alert_window(*index.window(entry), now)
+        if expirata:
+            continue
+        avertizari.append({**entry, "activa": activa})
+        next_change = _earliest(next_change, schimbare)
+    if not avertizari:
+        return {}
+    return {
+        "avertizari": avertizari,
+        "avertizare_zona": avertizari[0],
+        "_state": "active",
+        "_next_change": next_change,
+    }
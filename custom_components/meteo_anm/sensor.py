@@ -1,110 +1,268 @@
+import asyncio
 import logging
-from datetime import timedelta, datetime
-import async_timeout
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-import unicodedata
-import xml.etree.ElementTree as ET
-import html
-import re
+from datetime import timedelta
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import MATCH_ALL, EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from . import DIAGNOSTICS, DOMAIN, ENTITIES, FEEDS, LAST_CHECK, async_get_feed
+from .delta import alert_items_generale, alert_items_nowcasting, alert_items_xml
+from .frontend import MAP_FILE, map_svg_path
+from .static_config import API_PATH, DEFAULT_BASE_URL
+from .parsing import (
+    LocalityPattern,
+    attributes_hash,
+    build_avertizari_generale,
+    build_avertizari_harta,
+    build_avertizari_nowcasting,
+    build_avertizari_xml,
+    index_avertizari_generale,
+    index_avertizari_nowcasting,
+    index_prognoza_orase,
+    index_starea_vremii,
+    load_harta_svg_index,
+    locality_coordinates,
+    locality_slug,
+    normalize,
+    parse_localitati,
+    state_timestamp,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-BASE_URL = "https://www.meteoromania.ro/wp-json/meteoapi/v2/"
+# `path`: calea față de site (implicit API-ul JSON, `API_PATH` + endpoint).
+# `min_interval`: endpoint-urile care se schimbă rar (observații orare,
+# prognoza de câteva ori pe zi) nu sunt interogate mai des de atât, oricare
+# ar fi intervalul configurat; avertizările folosesc intervalul configurat.
+# `max_interval`: nowcasting-ul (avertizări de ordinul minutelor) este
+# interogat cel puțin atât de des, chiar dacă intervalul configurat e mai mare.
+# `indexer`: modelul/indexul payload-ului (vezi model.py), construit o dată
+# per payload și comun tuturor intrărilor (vezi `ANMFeed.async_get_index`).
+# `alert_items`: alertele urmărite pentru evenimentele meteo_anm_alert_* și
+# pentru intervalul mai rar fără alerte; cu `alert_events` False (avertizari-generale
+# repetă avertizările din XML), doar pentru interval.
+# `per_localitate`: câte o entitate pentru fiecare localitate a intrării.
 
 SENSOR_DEFINITIONS = [
     {
         "endpoint": "avertizari-generale",
         "name": "Avertizări Generale Meteo ANM",
         "icon": "mdi:weather-cloudy-alert",
+        "indexer": index_avertizari_generale,
+        "alert_items": alert_items_generale,
+        "alert_events": False,
     },
     {
         "endpoint": "avertizari-xml.php",
         "name": "Avertizări Generale Meteo ANM (XML)",
         "format": "xml",
-        "full_url": "https://www.meteoromania.ro/avertizari-xml.php",
+        "path": "avertizari-xml.php",
         "icon": "mdi:alert-box",
+        "alert_items": alert_items_xml,
     },
     {
         "endpoint": "avertizari-nowcasting",
         "name": "Avertizări Nowcasting Meteo ANM",
         "icon": "mdi:alert",
+        "max_interval": timedelta(seconds=60),
+        "indexer": index_avertizari_nowcasting,
+        "alert_items": alert_items_nowcasting,
     },
     {
         "endpoint": "starea-vremii",
         "name": "Starea Vremii Meteo ANM",
         "icon": "mdi:weather-hazy",
+        "min_interval": timedelta(minutes=10),
+        "indexer": index_starea_vremii,
+        "per_localitate": True,
     },
     {
         "endpoint": "prognoza-orase",
         "name": "Prognoza Orase Meteo ANM",
         "icon": "mdi:weather-partly-cloudy",
+        "min_interval": timedelta(minutes=30),
+        "indexer": index_prognoza_orase,
+        "per_localitate": True,
     },
     {
         "endpoint": "avertizari-harta",
         "name": "Harta Avertizari ANM",
         "format": "xml_map",
-        "full_url": "https://www.meteoromania.ro/avertizari-xml.php",
+        "path": "avertizari-xml.php",
         "icon": "mdi:map-marker-alert",
     },
 ]
 
 
+def endpoint_url(base_url, definition):
+    """URL-ul complet al unui endpoint pentru site-ul `base_url`."""
+    base_url = (base_url or DEFAULT_BASE_URL).rstrip("/") + "/"
+    return base_url + (definition.get("path") or f"{API_PATH}{definition['endpoint']}")
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     options = config_entry.options or {}
+    base_url = options.get("base_url") or config_entry.data.get("base_url") or DEFAULT_BASE_URL
     update_interval = timedelta(seconds=options.get("update_interval", config_entry.data.get("update_interval", 10)))
-    localitate = (options.get("localitate") or config_entry.data.get("localitate") or "").strip()
+    localitati = parse_localitati(options.get("localitate") or config_entry.data.get("localitate")) or [""]
+    # Localitatea inițială a intrării (din `data`, nu din opțiuni) păstrează
+    # entitatea și unique_id-ul de dinainte de localitățile multiple;
+    # celelalte sunt identificate după `locality_slug`, oricare le-ar fi ordinea.
+    originala = normalize((parse_localitati(config_entry.data.get("localitate")) or [""])[0])
     judet = (options.get("judet") or config_entry.data.get("judet") or "").strip()
     judet_long = (options.get("judet_long") or config_entry.data.get("judet_long") or "").strip()
-
-    sensors = [
-        ANMSensors(
-            hass,
-            definition["endpoint"],
-            definition["name"],
-            entry_id=config_entry.entry_id,
-            localitate=localitate,
-            judet=judet,
-            judet_long=judet_long,
-            data_format=definition.get("format", "json"),
-            full_url=definition.get("full_url"),
-            icon=definition.get("icon"),
-        )
+    compact_attributes = options.get("compact_attributes", config_entry.data.get("compact_attributes", False))
+    home = (hass.config.latitude, hass.config.longitude)
+    coordonate = {localitate: locality_coordinates(localitate, home) for localitate in localitati}
+    for localitate, lat_lon in coordonate.items():
+        if localitate.startswith("@") and lat_lon is None:
+            _LOGGER.warning("Coordonate invalide pentru localitatea %s (ex. @44.43 26.10 sau @acasa)", localitate)
+    # Punctul testat în contururile avertizărilor: prima localitate dată prin
+    # coordonate, altfel locația Home Assistant.
+    punct = next((lat_lon for lat_lon in coordonate.values() if lat_lon), None)
+    if punct is None and None not in home:
+        punct = home
+    # Harta încărcată de card; indexul ei dă cardului id-urile de colorat.
+    svg_path = await hass.async_add_executor_job(map_svg_path, hass)
+    svg_index = await hass.async_add_executor_job(load_harta_svg_index, svg_path) if svg_path else None
+    if svg_index is None:
+        _LOGGER.debug("Harta %s lipsește; cardul caută singur formele colorate.", svg_path or MAP_FILE)
+
+    # Un singur feed per URL distinct, comun tuturor intrărilor: senzorii XML
+    # (avertizari + harta) folosesc același document, descărcat și parsat o dată.
+    feeds = {}
+    endpoints = {}
+    sensors = []
+    for definition in SENSOR_DEFINITIONS:
+        data_format = definition.get("format", "json")
+        url = endpoint_url(base_url, definition)
+        if url not in feeds:
+            feeds[url] = async_get_feed(
+                hass,
+                url,
+                "json" if data_format == "json" else "xml",
+                min_interval=definition.get("min_interval"),
+                max_interval=definition.get("max_interval"),
+                indexer=definition.get("indexer"),
+                alert_items=definition.get("alert_items"),
+                alert_events=definition.get("alert_events", True),
+            )
+            config_entry.async_on_unload(feeds[url].async_register_interval(update_interval))
+            endpoints[url] = definition["endpoint"]
+        feed = feeds[url]
+        # Fiecare localitate are o entitate proprie, pe același feed și index.
+        per_localitate = definition.get("per_localitate")
+        for localitate in localitati if per_localitate else localitati[:1]:
+            legacy = not per_localitate or normalize(localitate) == originala
+            sensors.append(
+                ANMSensors(
+                    feed,
+                    definition["endpoint"],
+                    definition["name"] if legacy else f"{definition['name']} - {localitate}",
+                    entry_id=config_entry.entry_id,
+                    localitate=localitate,
+                    judet=judet,
+                    judet_long=judet_long,
+                    data_format=data_format,
+                    icon=definition.get("icon"),
+                    compact_attributes=compact_attributes,
+                    unique_suffix=None if legacy else locality_slug(localitate),
+                    svg_index=svg_index if data_format == "xml_map" else None,
+                    coordinates=coordonate[localitate] if definition.get("per_localitate") else punct,
+                )
+            )
+
+    await asyncio.gather(*(feed.async_ensure_data() for feed in feeds.values()))
+    for sensor in sensors:
+        sensor.async_process_feed()
+
+    _async_remove_stale_localitati(hass, config_entry, sensors)
+    # Pentru diagnostics.py și `async_add_diagnostic_sensors`; eliberat în async_unload_entry.
+    hass.data[DOMAIN].setdefault(ENTITIES, {})[config_entry.entry_id] = {
+        "add_entities": async_add_entities,
+        "endpoints": endpoints,
+        "sensors": sensors,
+    }
+    async_add_entities(sensors)
+    async_add_diagnostic_sensors(hass)
+
+
+@callback
+def async_add_diagnostic_sensors(hass):
+    """Senzorii de diagnostic aparțin feed-urilor comune, nu intrărilor.
+
+    Câte unul per URL (plus `ANMLastCheckSensor`), adăugat de prima intrare
+    încărcată care folosește feed-ul; la descărcarea ei, îl preia alta.
+    """
+    domain_data = hass.data[DOMAIN]
+    diagnostics = domain_data.setdefault(DIAGNOSTICS, {})
+    for entry in domain_data.get(ENTITIES, {}).values():
+        new = []
+        if domain_data.get(LAST_CHECK) is None:
+            domain_data[LAST_CHECK] = ANMLastCheckSensor()
+            new.append(domain_data[LAST_CHECK])
+        for url, endpoint in entry["endpoints"].items():
+            if url not in diagnostics:
+                diagnostics[url] = ANMEndpointDiagnosticSensor(endpoint, domain_data[FEEDS][url])
+                new.append(diagnostics[url])
+        if new:
+            entry["add_entities"](new)
+    last_check = domain_data.get(LAST_CHECK)
+    if last_check is not None and last_check.hass is not None:
+        last_check.async_track_feeds()
+
+
+@callback
+def _async_remove_stale_localitati(hass, config_entry, sensors):
+    """Șterge entitățile localităților scoase din opțiunile intrării.
+
+    Inclusiv entitatea fără sufix, dacă localitatea inițială nu mai este
+    configurată.
+    """
+    registry = er.async_get(hass)
+    unique_ids = {sensor.unique_id for sensor in sensors}
+    legacy_ids = {
+        f"{config_entry.entry_id}_{definition['endpoint']}"
         for definition in SENSOR_DEFINITIONS
-    ]
-
-    async_add_entities(sensors, update_before_add=True)
-
-    async def _safe_update(sensor):
-        try:
-            await sensor.async_update()
-        except Exception as err:
-            _LOGGER.error("Eroare la actualizarea %s: %s", sensor.name, err)
-
-    async def update_sensors(now):
-        _LOGGER.info("Se execută actualizarea senzorilor ANM la intervalul setat.")
-        for sensor in sensors:
-            sensor.hass.async_create_task(sensor.async_update())
-
-    async_track_time_interval(hass, update_sensors, update_interval)
+        if definition.get("per_localitate")
+    }
+    prefixes = tuple(f"{legacy_id}_" for legacy_id in legacy_ids)
+    for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        stale = entry.unique_id in legacy_ids or entry.unique_id.startswith(prefixes)
+        if stale and entry.unique_id not in unique_ids:
+            registry.async_remove(entry.entity_id)
 
 
+class ANMSensors(CoordinatorEntity):
+    # Atribute voluminoase (mesaje, hărți, zone) care nu sunt scrise în recorder.
+    _unrecorded_attributes = frozenset({"avertizari", "maps", "shapes", "prognoza_oras"})
 
-class ANMSensors(Entity):
-    def __init__(self, hass, endpoint, display_name, entry_id, localitate=None, judet=None, judet_long=None, data_format="json", full_url=None, icon=None):
-        self._hass = hass
+    def __init__(self, feed, endpoint, display_name, entry_id, localitate=None, judet=None, judet_long=None, data_format="json", icon=None, compact_attributes=False, unique_suffix=None, svg_index=None, coordinates=None):
+        super().__init__(feed)
         self._endpoint = endpoint
         self._name = display_name
         self._entry_id = entry_id
+        self._unique_suffix = unique_suffix
         self._localitate = (localitate or "").strip().upper()
+        self._localitate_pattern = LocalityPattern(self._localitate)
         self._judet = (judet or "").strip().upper()
         self._judet_long = (judet_long or "").strip().upper()
         self._data_format = data_format
-        self._full_url = full_url
+        self._compact = bool(compact_attributes)
+        self._svg_index = svg_index
+        self._coordinates = coordinates
+        self._far_warned = False
         self._state = None
         self._attributes = {}
+        self._content_hash = None
+        self._next_change = None
+        self._unsub_transition = None
         self._icon = icon or "mdi:weather-sunny-alert"
+        self.state_writes = 0
 
     @property
     def name(self):
@@ -124,78 +282,91 @@ class ANMSensors(Entity):
 
     @property
     def unique_id(self):
+        if self._unique_suffix:
+            return f"{self._entry_id}_{self._endpoint}_{self._unique_suffix}"
         return f"{self._entry_id}_{self._endpoint}"
     
     @property
-    def should_poll(self) -> bool:
-        return False
-
-    def _normalize(self, text: str) -> str:
-        if not isinstance(text, str):
-            return ""
-        return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().upper()
-
-    def _clean_html(self, value: str) -> str:
-        if not isinstance(value, str):
-            return value
-        text = html.unescape(value)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = " ".join(text.split())
-        # Corectăm separări artificiale apărute din HTML (ex: AT ENȚIONARE)
-        text = re.sub(r"\bAT\s+EN([ȚȚŢT])", r"ATEN\1", text, flags=re.IGNORECASE)
-        return text
-
-    def _localitate_match(self, nume: str) -> bool:
-        """Potrivește numele orașului, permițând excluderi: ex. 'CONSTANTA !DIG'."""
-        if not self._localitate:
-            return False
-        name = (nume or "").upper()
-        tokens = [t.strip().upper() for t in self._localitate.split("!") if t.strip()]
-        include = tokens[0] if tokens else self._localitate.upper()
-        excludes = tokens[1:] if len(tokens) > 1 else []
-        if include and include not in name:
-            return False
-        if any(ex in name for ex in excludes):
-            return False
-        return True
-
-
-    async def async_update(self, now=None):
-        url = self._full_url or f"{BASE_URL}{self._endpoint}"
-        _LOGGER.debug("Actualizare date %s de la %s", self._name, url)
+    def available(self):
+        # La erori de rețea păstrăm ultima stare cunoscută.
+        return self._state is not None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self._async_schedule_transition(self._next_change)
+
+    async def async_will_remove_from_hass(self):
+        self._async_schedule_transition(None)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _async_schedule_transition(self, when):
+        """Reevaluează filtrul local la începutul/expirarea următoarei avertizări.
+
+        Starea se schimbă la momentul exact, fără o cerere nouă la ANM.
+        """
+        self._next_change = when
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        if when is not None and self.hass is not None and self.entity_id:
+            self._unsub_transition = async_track_point_in_utc_time(self.hass, self._async_transition, when)
+
+    @callback
+    def _async_transition(self, _now):
+        self._unsub_transition = None
+        _LOGGER.debug("Senzor ANM %s: o avertizare a început sau a expirat.", self._name)
+        self.async_process_feed(local=True)
+
+    @callback
+    def _handle_coordinator_update(self):
+        self.async_process_feed()
+
+    @callback
+    def async_process_feed(self, local=False):
+        """Aplică filtrul senzorului pe payload-ul deja parsat al feed-ului.
+
+        Starea (momentul ultimei modificări) și atributele se scriu doar dacă
+        rezultatul filtrat diferă de cel anterior; momentul ultimei verificări
+        este expus separat, de senzorul de diagnostic `ANMLastCheckSensor`.
+        Cu `local` (începutul/expirarea unei avertizări), ultimele date bune
+        sunt reevaluate chiar dacă ultima actualizare a eșuat.
+        """
+        if not local and not self.coordinator.last_update_success:
+            return
+        if self.coordinator.data is None:
+            return
+        data = self.coordinator.data
         try:
-            async with async_timeout.timeout(5):
-                session = async_get_clientsession(self._hass)
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        _LOGGER.error("Eroare HTTP %s la preluarea datelor ANM de la %s", response.status, url)
-                        return
-
-                    if self._data_format == "xml":
-                        text = await response.text()
-                        parsed = self._parse_data(text, is_xml=True)
-                    elif self._data_format == "xml_map":
-                        text = await response.text()
-                        parsed = self._parse_avertizari_harta(text)
-                    else:
-                        data = await response.json()
-                        if not data or isinstance(data, str):
-                            _LOGGER.warning("Nu există date disponibile pentru %s: %s", self._name, data)
-                            self._set_state_inactive()
-                            return
-                        parsed = self._parse_data(data)
-                    if parsed:
-                        state_override = parsed.pop("_state", None)
-                        self._state = state_override if state_override is not None else "active"
-                        self._attributes = {
-                            **parsed,
-                            "friendly_name": self._name,
-                        }
-                    else:
-                        self._set_state_inactive()
-                    if self.hass and self.entity_id:
-                        self.async_write_ha_state()
-                    _LOGGER.info("Senzor ANM %s actualizat cu succes.", self._name)
+            if self._data_format == "xml":
+                parsed = self._parse_data(data, is_xml=True)
+            elif self._data_format == "xml_map":
+                parsed = self._parse_avertizari_harta(data)
+            elif not data or isinstance(data, str):
+                _LOGGER.warning("Nu există date disponibile pentru %s: %s", self._name, data)
+                parsed = None
+            else:
+                parsed = self._parse_data(data)
+            state_override = parsed.pop("_state", None) if parsed else None
+            self._async_schedule_transition(parsed.pop("_next_change", None) if parsed else None)
+            content_hash = attributes_hash(parsed or None)
+            if content_hash == self._content_hash:
+                _LOGGER.debug("Senzor ANM %s: conținut neschimbat, starea nu este rescrisă.", self._name)
+                return
+            self._content_hash = content_hash
+            if parsed:
+                self._state = state_override if state_override is not None else "active"
+                self._attributes = {
+                    **parsed,
+                    "friendly_name": self._name,
+                }
+            else:
+                self._set_state_inactive()
+            if self.hass and self.entity_id:
+                self.async_write_ha_state()
+                self.state_writes += 1
+                self.coordinator.stats["state_writes"] += 1
+            _LOGGER.debug("Senzor ANM %s actualizat cu succes.", self._name)
         except Exception as e:
             _LOGGER.error("Eroare la actualizarea datelor ANM pentru %s: %s", self._name, e)
 
@@ -220,307 +391,141 @@ class ANMSensors(Entity):
             return self._parse_prognoza_orase(data)
 
     def _parse_avertizari_generale(self, data):
-        avertizare = data.get("avertizare")
-        if isinstance(avertizare, dict):
-            avertizare = [avertizare]
-
-        rezultate = []
-        match = None
-
-        if isinstance(avertizare, list):
-            for item in avertizare:
-                if not isinstance(item, dict):
-                    continue
-                a_attrs = item.get("@attributes", {}) or {}
-                judete = item.get("judet", [])
-                if isinstance(judete, dict):
-                    judete = [judete]
-
-                for judet in judete:
-                    if not isinstance(judet, dict):
-                        continue
-                    j_attrs = judet.get("@attributes", {}) or {}
-                    cod = (j_attrs.get("cod") or "").upper()
-                    entry = {
-                        "judet": cod,
-                        "culoare": j_attrs.get("culoare"),
-                        "use_coord_gis": j_attrs.get("useCoordGis"),
-                        "coord_gis": j_attrs.get("coordGis"),
-                        "fenomene_vizate": a_attrs.get("fenomeneVizate"),
-                        "data_expirarii": a_attrs.get("dataExpirarii"),
-                        "data_aparitiei": a_attrs.get("dataAparitiei"),
-                        "intervalul": a_attrs.get("intervalul"),
-                        "mesaj": a_attrs.get("zonaAfectata"),
-                        "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
-                        "culoare_generala": a_attrs.get("culoare"),
-                    }
-                    rezultate.append(entry)
-                    if self._judet and cod == self._judet:
-                        match = entry
-
-        timestamp = datetime.utcnow().isoformat()
-        if self._judet:
-            return {"avertizari": [match]} if match else {}
-        return {}
+        return build_avertizari_generale(
+            self.coordinator.async_get_index(), self._judet, compact=self._compact, punct=self._coordinates
+        )
 
-    def _parse_avertizari_generale_xml(self, text):
-        """Parsează XML-ul care poate conține mai multe <avertizare>.
+    def _parse_avertizari_generale_xml(self, model):
+        """Avertizările din modelul XML comun, filtrate după județul senzorului."""
+        return build_avertizari_xml(model, self._judet, compact=self._compact, now=dt_util.utcnow(), punct=self._coordinates)
+
+    def _parse_avertizari_harta(self, model):
+        """Toate hărțile din modelul XML comun (vezi `build_avertizari_harta`)."""
+        return build_avertizari_harta(model, compact=self._compact, now=dt_util.utcnow(), svg_index=self._svg_index)
+
+    def _find_localitate(self):
+        """Atributele localității: după coordonate (cea mai apropiată) sau după nume."""
+        index = self.coordinator.async_get_index()
+        if self._coordinates is None:
+            record = index.find(self._localitate_pattern)
+            return record.as_dict() if record is not None else None
+        nearest = index.nearest(*self._coordinates)
+        if nearest is None:
+            if len(index) and not self._far_warned:
+                self._far_warned = True
+                _LOGGER.warning(
+                    "Nicio localitate %s în apropierea coordonatelor %s pentru %s; setați localitatea după nume.",
+                    self._endpoint, self._coordinates, self._name,
+                )
+            return None
+        record, distanta = nearest
+        return {**record.as_dict(), "distanta_km": distanta}
 
-        Returnăm toate avertizările în ordine (așa cum vin în feed) și
-        includem mesajul aferent fiecărui set de județe. Dacă este filtrat
-        după județ, păstrăm doar intrările care îl conțin.
-        """
-        try:
-            root = ET.fromstring(text)
-        except ET.ParseError as err:
-            _LOGGER.error("Eroare la parsarea XML: %s", err)
+    def _parse_starea_vremii(self, data):
+        if not isinstance(data.get("features"), list):
             return {}
+        oras_selectat = self._find_localitate()
+        if oras_selectat:
+            return {
+                "oras_selectat": oras_selectat,
+                "_state": state_timestamp(dt_util.utcnow()),
+            }
+        # No match means no state update
+        return {}
 
-        avertizari = []
-        filtered = []
-
-        for avertizare in root.findall("avertizare"):
-            a_attrs = avertizare.attrib or {}
-            judete = avertizare.findall("judet") or []
-            zone = avertizare.findall("zona") or []
-            judete_entries = []
-
-            for judet in judete:
-                j_attrs = judet.attrib or {}
-                cod = (j_attrs.get("cod") or "").upper()
-                culoare = (j_attrs.get("culoare") or "").strip()
-                if not culoare or culoare == "0":
-                    continue
-
-                zone_match = []
-                for z in zone:
-                    if not isinstance(z, ET.Element):
-                        continue
-                    z_attrs = z.attrib or {}
-                    z_cod = (z_attrs.get("cod") or "").upper()
-                    if z_cod and (z_cod.startswith(f"{cod}_") or z_cod == cod):
-                        z_culoare = (z_attrs.get("culoare") or "").strip()
-                        zone_match.append({
-                            "cod": z_cod,
-                            "culoare": z_culoare,
-                        })
-
-                entry = {
-                    "judet": cod,
-                    "culoare": culoare,
-                    "fenomene_vizate": a_attrs.get("fenomeneVizate"),
-                    "data_expirarii": a_attrs.get("dataExpirarii"),
-                    "data_aparitiei": a_attrs.get("dataAparitiei"),
-                    "intervalul": a_attrs.get("intervalul"),
-                    "mesaj": self._clean_html(a_attrs.get("mesaj")),
-                    "zona_afectata": self._clean_html(a_attrs.get("zonaAfectata")),
-                    "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
-                    "zone": zone_match or None,
-                }
-                judete_entries.append(entry)
-
-            alert_entry = {
-                "meta": {
-                    "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
-                    "data_aparitiei": a_attrs.get("dataAparitiei"),
-                    "data_expirarii": a_attrs.get("dataExpirarii"),
-                    "fenomene_vizate": a_attrs.get("fenomeneVizate"),
-                    "mesaj": self._clean_html(a_attrs.get("mesaj")),
-                    "culoare": a_attrs.get("culoare"),
-                },
-                "judete": judete_entries,
+    def _parse_prognoza_orase(self, data):
+        localitate_selectata = self._find_localitate()
+        if localitate_selectata:
+            return {
+                "prognoza_oras": localitate_selectata,
+                "_state": state_timestamp(dt_util.utcnow()),
             }
-            avertizari.append(alert_entry)
+        return {}
 
-            if self._judet:
-                judet_matches = [j for j in judete_entries if j.get("judet") == self._judet]
-                if judet_matches:
-                    filtered.append({**alert_entry, "judete": judet_matches})
+    def _parse_avertizari_nowcasting(self, data):
+        return build_avertizari_nowcasting(self.coordinator.async_get_index(), self._judet_long, now=dt_util.utcnow())
 
-        timestamp = datetime.utcnow().isoformat().replace("T", " ")
-        if self._judet:
-            if not filtered:
-                return {}
-            return {"avertizari": filtered, "_state": timestamp}
-        return {"avertizari": avertizari, "_state": timestamp}
 
-    def _parse_avertizari_harta(self, text):
-        """Parsează toate hărțile din XML.
+class ANMLastCheckSensor(SensorEntity):
+    """Diagnostic: ultima verificare reușită a feed-urilor ANM.
 
-        Pentru fiecare <avertizare> întoarcem lista de zone/județe și mesajul,
-        astfel încât UI-ul să poată afișa cronologic fiecare hartă colorată.
-        """
-        try:
-            root = ET.fromstring(text)
-        except ET.ParseError as err:
-            _LOGGER.error("Eroare la parsarea XML harta: %s", err)
-            return {}
+    Se actualizează la fiecare interogare (inclusiv 304 / conținut neschimbat),
+    astfel încât senzorii principali să-și rescrie starea doar la modificări.
+    """
 
-        maps = []
-        for avertizare in root.findall("avertizare"):
-            a_attrs = avertizare.attrib or {}
-            shapes = []
-            for elem in list(avertizare):
-                if elem.tag not in ("judet", "zona"):
-                    continue
-                attrs = elem.attrib or {}
-                cod = (attrs.get("cod") or "").upper().replace("-", "_")
-                culoare = (attrs.get("culoare") or "").strip()
-                if not culoare or culoare == "0":
-                    continue
-                color_name = {"1": "yellow", "2": "orange", "3": "red"}.get(culoare, "green")
-                shapes.append({
-                    "id": cod,
-                    "color": color_name,
-                    "culoare": culoare,
-                })
-            if shapes:
-                maps.append({
-                    "meta": {
-                        "tip_mesaj": a_attrs.get("numeTipMesaj") or a_attrs.get("tipMesaj"),
-                        "data_aparitiei": a_attrs.get("dataAparitiei"),
-                        "data_expirarii": a_attrs.get("dataExpirarii"),
-                        "mesaj": self._clean_html(a_attrs.get("mesaj")),
-                    },
-                    "shapes": shapes,
-                })
-
-        if maps:
-            ts = datetime.utcnow().isoformat().replace("T", " ")
-            # păstrăm shapes pentru compatibilitate (prima hartă)
-            first_shapes = maps[0].get("shapes") if maps else None
-            payload = {"maps": maps, "_state": ts}
-            if first_shapes:
-                payload["shapes"] = first_shapes
-            return payload
-        return {}
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:update"
+    _attr_should_poll = False
+    _attr_name = "Ultima verificare ANM"
+    _attr_unique_id = "ultima_verificare"
 
+    def __init__(self):
+        self._feeds = set()
 
+    async def async_added_to_hass(self):
+        self.async_track_feeds()
 
-    def _parse_starea_vremii(self, data):
-        starea_vremii = data.get("features")
-        if isinstance(starea_vremii, list):
-            attrs = []
-            oras_selectat = None
-            for feature in starea_vremii:
-                properties = feature.get("properties", {})
-                entry = {
-                    "nume": properties.get("nume"),
-                    "temperatura": properties.get("tempe"),
-                    "umiditate": properties.get("umezeala"),
-                    "presiune": properties.get("presiunetext"),
-                    "nebulozitate": properties.get("nebulozitate"),
-                    "fenomene": properties.get("fenomen_e"),
-                    "zapada": properties.get("zapada"),
-                    "tempapa": properties.get("tempapa"),
-                    "vant": properties.get("vant"),
-                    "last_update": properties.get("actualizat").replace("&nbsp;", " "),
-                }
-                attrs.append(entry)
-
-                nume = properties.get("nume")
-                if self._localitate and isinstance(nume, str) and self._localitate_match(nume):
-                    oras_selectat = entry
-            timestamp = datetime.utcnow().isoformat()
-            if oras_selectat:
-                return {
-                    "oras_selectat": oras_selectat,
-                    "_state": timestamp.replace("T", " "),
-                }
-            # No match means no state update
-            return {}
-            
-        return {}
-        
-    def _parse_prognoza_orase(self, data):
-        tara = data.get("tara", {})
-        localitati = tara.get("localitate", [])
-
-        if isinstance(localitati, dict):
-            localitati = [localitati]
-
-        rezultate = []
-        localitate_selectata = None
-
-        if isinstance(localitati, list):
-            for loc in localitati:
-                if not isinstance(loc, dict):
-                    continue
-                attrs = loc.get("@attributes", {}) or {}
-                nume_loc = attrs.get("nume")
-                prognoze = loc.get("prognoza", [])
-                if isinstance(prognoze, dict):
-                    prognoze = [prognoze]
-
-                zile = []
-                for prog in prognoze:
-                    if not isinstance(prog, dict):
-                        continue
-                    prog_attrs = prog.get("@attributes", {}) or {}
-                    zile.append({
-                        "data": prog_attrs.get("data"),
-                        "temp_min": prog.get("temp_min"),
-                        "temp_max": prog.get("temp_max"),
-                        "fenomen_descriere": prog.get("fenomen_descriere"),
-                        "fenomen_simbol": prog.get("fenomen_simbol"),
-                    })
-
-                entry = {
-                    "nume": nume_loc,
-                    "data_prognozei": loc.get("DataPrognozei"),
-                    "prognoza": zile,
-                }
-                rezultate.append(entry)
+    async def async_will_remove_from_hass(self):
+        if self.hass.data.get(DOMAIN, {}).get(LAST_CHECK) is self:
+            self.hass.data[DOMAIN].pop(LAST_CHECK)
 
-                if self._localitate and isinstance(nume_loc, str) and self._localitate in nume_loc.upper():
-                    localitate_selectata = entry
+    @callback
+    def async_track_feeds(self):
+        """Ascultă și feed-urile create după adăugarea senzorului."""
+        feeds = set(self.hass.data[DOMAIN].get(FEEDS, {}).values())
+        for feed in feeds - self._feeds:
+            self.async_on_remove(feed.async_add_check_listener(self._async_feed_checked))
+        self._feeds = feeds
 
-        timestamp = datetime.utcnow().isoformat()
-        if localitate_selectata:
-            return {
-                "prognoza_oras": localitate_selectata,
-                "_state": timestamp.replace("T", " "),
-            }
-        # if rezultate:
-        #     return {
-        #         "prognoza_orase": rezultate,
-        #         "_state": timestamp,
-        #     }
-        return {}
+    @callback
+    def _async_feed_checked(self):
+        self.async_write_ha_state()
 
-    def _parse_avertizari_nowcasting(self, data):
-        avertizare = data.get("avertizare")
-        zona_selectata = None
-        rezultate = []
-
-        if isinstance(avertizare, dict):
-            attrs = avertizare.get("@attributes", {}) or {}
-            zona = attrs.get("zona") or ""
-            entry = {
-                "tip_mesaj": attrs.get("numeTipMesaj") or attrs.get("tipMesaj"),
-                "data_inceput": attrs.get("dataInceput"),
-                "data_sfarsit": attrs.get("dataSfarsit"),
-                "zona": attrs.get("zona"),
-                "semnalare": attrs.get("semnalare"),
-                "culoare": attrs.get("numeCuloare") or attrs.get("culoare"),
-                "modificat": attrs.get("modificat"),
-                "creat": attrs.get("creat"),
-            }
-            
-            rezultate.append(entry)
-
-            if self._judet_long:
-                if self._normalize(self._judet_long) in self._normalize(zona):
-                    zona_selectata = entry
-                else:
-                    rezultate = []  # force no match
-            
-
-        timestamp = datetime.utcnow().isoformat()
-        if zona_selectata:
-            return {
-                "avertizare_zona": zona_selectata,
-                "_state": "active",
-            }
-        else:
-            return {}
+    @property
+    def native_value(self):
+        feeds = self.hass.data.get(DOMAIN, {}).get(FEEDS, {}).values() if self.hass else ()
+        checked = [feed.last_checked for feed in feeds if feed.last_checked]
+        return max(checked) if checked else None
+
+
+class ANMEndpointDiagnosticSensor(SensorEntity):
+    """Diagnostic per URL: durata ultimei cereri și statisticile feed-ului.
+
+    Atributele (octeți, parsare, rata 304 / neschimbate, circuitul, scrierile
+    de stare ale senzorilor feed-ului) se schimbă la fiecare verificare și nu
+    sunt scrise în recorder; istoricul păstrează doar durata.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+    _attr_should_poll = False
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(self, endpoint, feed):
+        self._feed = feed
+        self._attr_name = f"Diagnostic ANM {endpoint}"
+        self._attr_unique_id = f"diagnostic_{feed.url}"
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(self._feed.async_add_check_listener(self._async_feed_checked))
+
+    async def async_will_remove_from_hass(self):
+        diagnostics = self.hass.data.get(DOMAIN, {}).get(DIAGNOSTICS, {})
+        if diagnostics.get(self._feed.url) is self:
+            diagnostics.pop(self._feed.url)
+
+    @callback
+    def _async_feed_checked(self):
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        return self._feed.stats["fetch_ms"]
+
+    @property
+    def extra_state_attributes(self):
+        return self._feed.diagnostics()
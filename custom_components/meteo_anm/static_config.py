@@ -1,5 +1,10 @@
 domain="meteo_anm"
 
+# Site-ul ANM; poate fi schimbat din opțiuni (ex. serverul de test din
+# benchmarks/anm_mock_server.py). API-ul JSON este sub API_PATH.
+DEFAULT_BASE_URL = "https://www.meteoromania.ro/"
+API_PATH = "wp-json/meteoapi/v2/"
+
 JUDETE = {
     "AB": "Alba",
     "AR": "Arad",
@@ -43,4 +48,52 @@ JUDETE = {
     "VL": "Vâlcea",
     "VS": "Vaslui",
     "VN": "Vrancea"
-}
\ No newline at end of file
+}
+# Coordonatele (lat, lon) orașelor din prognoza-orase, care nu are geometrie:
+# reședințele de județ și câteva stații de pe litoral / din Delta.
+COORDONATE_ORASE = {
+    "Alba Iulia": (46.07, 23.58),
+    "Alexandria": (43.97, 25.33),
+    "Arad": (46.18, 21.31),
+    "Bacău": (46.57, 26.91),
+    "Baia Mare": (47.66, 23.57),
+    "Bistrița": (47.13, 24.50),
+    "Botoșani": (47.75, 26.67),
+    "Brăila": (45.27, 27.96),
+    "Brașov": (45.66, 25.61),
+    "București": (44.43, 26.10),
+    "Buftea": (44.56, 25.95),
+    "Buzău": (45.15, 26.82),
+    "Călărași": (44.20, 27.33),
+    "Cluj-Napoca": (46.77, 23.60),
+    "Constanța": (44.18, 28.63),
+    "Craiova": (44.32, 23.80),
+    "Deva": (45.88, 22.91),
+    "Drobeta-Turnu Severin": (44.63, 22.66),
+    "Focșani": (45.70, 27.18),
+    "Galați": (45.44, 28.05),
+    "Giurgiu": (43.90, 25.97),
+    "Iași": (47.16, 27.59),
+    "Mangalia": (43.82, 28.58),
+    "Miercurea Ciuc": (46.36, 25.80),
+    "Oradea": (47.07, 21.93),
+    "Piatra Neamț": (46.93, 26.37),
+    "Pitești": (44.86, 24.87),
+    "Ploiești": (44.94, 26.02),
+    "Râmnicu Vâlcea": (45.10, 24.37),
+    "Reșița": (45.30, 21.89),
+    "Satu Mare": (47.79, 22.89),
+    "Sfântu Gheorghe": (45.87, 25.79),
+    "Sibiu": (45.79, 24.15),
+    "Slatina": (44.43, 24.37),
+    "Slobozia": (44.56, 27.37),
+    "Suceava": (47.65, 26.26),
+    "Sulina": (45.16, 29.65),
+    "Târgoviște": (44.93, 25.46),
+    "Târgu Jiu": (45.04, 23.27),
+    "Târgu Mureș": (46.54, 24.56),
+    "Timișoara": (45.75, 21.23),
+    "Tulcea": (45.18, 28.80),
+    "Vaslui": (46.64, 27.73),
+    "Zalău": (47.19, 23.06),
+}
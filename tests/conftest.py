@@ -0,0 +1,51 @@
+"""Fixture-uri comune: payload-uri ANM înregistrate, fără acces la rețea."""
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+# Documentul XML real, păstrat în rădăcina repository-ului.
+RECORDED_XML = os.path.join(ROOT, "avertizari-xml.xml")
+
+sys.path.insert(0, ROOT)
+
+# Testele care pornesc Home Assistant (feed-uri, setup/reload) rulează doar cu
+# pytest-homeassistant-custom-component instalat; restul sunt pure.
+try:
+    import pytest_homeassistant_custom_component  # noqa: F401
+except ImportError:
+    pass
+else:
+    pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+    def pytest_configure(config):
+        # Fixture-ul `hass` este asincron.
+        config.option.asyncio_mode = "auto"
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES, name)
+
+
+def load_bytes(name):
+    with open(fixture_path(name), "rb") as file:
+        return file.read()
+
+
+def load_json(name):
+    with open(fixture_path(name), encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def recorded_xml():
+    with open(RECORDED_XML, "rb") as file:
+        return file.read()
+
+
+@pytest.fixture
+def zone_xml():
+    return load_bytes("avertizari-xml-zone.xml")
@@ -0,0 +1,124 @@
+"""Diferențele de alerte între două payload-uri (evenimentele meteo_anm_alert_*)."""
+from datetime import datetime
+
+from conftest import load_json
+from custom_components.meteo_anm.delta import (
+    AlertTracker,
+    alert_items_generale,
+    alert_items_nowcasting,
+    alert_items_xml,
+    color_level,
+    has_current_alerts,
+)
+from custom_components.meteo_anm.model import Alert
+from custom_components.meteo_anm.parsing import (
+    ANM_TIME_ZONE,
+    index_avertizari_generale,
+    index_avertizari_nowcasting,
+    parse_avertizari_xml,
+)
+
+
+def _with_color(model, index, cod, culoare):
+    """Copie a modelului cu altă culoare pentru județul `cod` din avertizarea `index`."""
+    avertizare = model[index]
+    fields = {name: getattr(avertizare, name) for name in avertizare._fields}
+    fields["elemente"] = [
+        type(element)(element.cod, culoare, element.geometry) if element.cod == cod else element
+        for element in avertizare.elemente
+    ]
+    copy = list(model)
+    copy[index] = Alert(**fields)
+    return copy
+
+
+def test_color_level():
+    assert [color_level(c) for c in ("1", "2", "3", "0", "", None)] == [1, 2, 3, 0, 0, 0]
+    assert [color_level(c) for c in ("galben", "Cod portocaliu", "roșu")] == [1, 2, 3]
+
+
+def test_first_update_is_baseline(zone_xml):
+    tracker = AlertTracker()
+
+    assert tracker.update(alert_items_xml(parse_avertizari_xml(zone_xml))) == ([], [], [])
+
+
+def test_xml_items(zone_xml):
+    items = alert_items_xml(parse_avertizari_xml(zone_xml))
+
+    # Județele și zonele verzi nu sunt alerte.
+    assert not any(item.get("judet") == "HR" or item.get("zona") == "HR_1" for item in items.values())
+    assert sum(1 for item in items.values() if "zona" in item) == 6
+    assert sum(1 for item in items.values() if "judet" in item) == 7
+
+
+def test_upgrade_downgrade_expiry(zone_xml):
+    model = parse_avertizari_xml(zone_xml)
+    tracker = AlertTracker()
+    tracker.update(alert_items_xml(model))
+
+    added, upgraded, expired = tracker.update(alert_items_xml(_with_color(model, 0, "BV", "3")))
+    assert added == [] and expired == []
+    assert [(u["judet"], u["culoare"], u["culoare_anterioara"]) for u in upgraded] == [("BV", "3", "1")]
+
+    added, upgraded, expired = tracker.update(alert_items_xml(_with_color(model, 0, "CJ", "1")))
+    assert upgraded == []
+    assert [(a["judet"], a["culoare"]) for a in added] == [("CJ", "1"), ("BV", "1")]
+    assert [(e["judet"], e["culoare"]) for e in expired] == [("CJ", "2"), ("BV", "3")]
+
+    added, upgraded, expired = tracker.update(alert_items_xml(model[1:]))
+    assert added == [] and upgraded == []
+    assert {e.get("judet") or e.get("zona") for e in expired} == {
+        "CJ", "BV", "CJ_1", "CJ_2", "CJ_3", "CJ_4", "BV_1", "BV_2",
+    }
+
+
+def test_expiry_while_still_in_feed(zone_xml):
+    items = alert_items_xml(parse_avertizari_xml(zone_xml))
+    tracker = AlertTracker()
+    tracker.update(items, datetime(2026, 7, 14, 12, 0, tzinfo=ANM_TIME_ZONE))
+    first_end = datetime(2026, 7, 15, 8, 0, tzinfo=ANM_TIME_ZONE)
+    assert tracker.next_expiry() == first_end
+
+    # ANM păstrează avertizarea în feed după `dataExpirarii`.
+    added, upgraded, expired = tracker.update(items, first_end)
+    assert added == [] and upgraded == []
+    assert {e.get("judet") or e.get("zona") for e in expired} == {
+        "CJ", "BV", "CJ_1", "CJ_2", "CJ_3", "CJ_4", "BV_1", "BV_2",
+    }
+    assert tracker.next_expiry() > first_end
+    # Nu este anunțată din nou când dispare din feed.
+    remaining = {key: item for key, item in items.items() if item["data_expirarii"] != expired[0]["data_expirarii"]}
+    assert tracker.update(remaining, first_end) == ([], [], [])
+
+
+def test_nowcasting_added():
+    data = load_json("avertizari-nowcasting.json")
+    tracker = AlertTracker()
+    tracker.update(alert_items_nowcasting(index_avertizari_nowcasting({"avertizare": data["avertizare"][:1]})))
+
+    added, upgraded, expired = tracker.update(alert_items_nowcasting(index_avertizari_nowcasting(data)))
+    assert [a["zona"] for a in added] == [
+        "Județul Satu Mare: Carei, Negrești-Oaș",
+        "Județul Caraș-Severin: Reșița; Județul Cluj: Turda",
+    ]
+    assert all(a["sursa"] == "nowcasting" for a in added)
+    assert upgraded == [] and expired == []
+
+
+def test_current_alerts_ignore_expired(zone_xml):
+    items = alert_items_xml(parse_avertizari_xml(zone_xml))
+
+    # Alertele expirate rămân în feed, dar nu mai împiedică intervalul rar.
+    assert has_current_alerts(items, datetime(2026, 7, 14, 12, 0, tzinfo=ANM_TIME_ZONE))
+    assert has_current_alerts(items, datetime(2026, 12, 1, tzinfo=ANM_TIME_ZONE))
+    assert not has_current_alerts(items, datetime(2030, 1, 1, tzinfo=ANM_TIME_ZONE))
+    assert not has_current_alerts({}, datetime(2026, 7, 14, tzinfo=ANM_TIME_ZONE))
+
+    generale = alert_items_generale(index_avertizari_generale(load_json("avertizari-generale.json")))
+    assert generale and all(item["sursa"] == "generale" for item in generale.values())
+    assert not has_current_alerts(generale, datetime(2030, 1, 1, tzinfo=ANM_TIME_ZONE))
+
+    nowcasting = alert_items_nowcasting(index_avertizari_nowcasting(load_json("avertizari-nowcasting.json")))
+    assert nowcasting
+    assert not has_current_alerts(nowcasting, datetime(2030, 1, 1, tzinfo=ANM_TIME_ZONE))
@@ -0,0 +1,208 @@
+"""Feed-ul comun: circuit breaker, reîncercări, cereri condiționale, cache, executor."""
+import asyncio
+from datetime import timedelta
+import json
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse  # noqa: E402
+
+from custom_components.meteo_anm import feed as feed_module  # noqa: E402
+from custom_components.meteo_anm.delta import alert_items_xml  # noqa: E402
+from custom_components.meteo_anm.feed import (  # noqa: E402
+    BREAKER_BASE_COOLDOWN,
+    BREAKER_FAILURE_THRESHOLD,
+    EXECUTOR_PARSE_THRESHOLD,
+    QUIET_INTERVAL_FACTOR,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    ANMFeed,
+    FeedCache,
+    HostCircuitBreaker,
+)
+from custom_components.meteo_anm.parsing import parse_avertizari_xml, prepare_avertizari_model  # noqa: E402
+
+URL = "https://anm.test/api/starea-vremii"
+XML_URL = "https://anm.test/avertizari-xml.php"
+PAYLOAD = {"features": []}
+
+
+@pytest.fixture(autouse=True)
+def no_content_length(monkeypatch):
+    # Răspunsurile simulate nu au Content-Length (ca un răspuns chunked).
+    monkeypatch.setattr(AiohttpClientMockResponse, "content_length", None, raising=False)
+
+
+def respond_in_turn(aioclient_mock, url, *responses):
+    """Răspunsurile `(status, body, headers)` date pe rând, câte unul per cerere."""
+    pending = list(responses)
+
+    async def side_effect(method, request_url, data):
+        status, body, headers = pending.pop(0)
+        return AiohttpClientMockResponse(method, request_url, status=status, response=body, headers=headers)
+
+    aioclient_mock.get(url, side_effect=side_effect)
+
+
+def test_breaker_closed_open_half_open(freezer):
+    breaker = HostCircuitBreaker("anm.test")
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow_request()
+    assert breaker.next_attempt == dt_util.utcnow() + BREAKER_BASE_COOLDOWN
+
+    freezer.tick(BREAKER_BASE_COOLDOWN)
+    assert breaker.allow_request() and breaker.state == "half_open"
+    # Încercarea de test eșuează: circuitul se redeschide, cu pauză dublă.
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.next_attempt == dt_util.utcnow() + 2 * BREAKER_BASE_COOLDOWN
+
+    freezer.tick(2 * BREAKER_BASE_COOLDOWN)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.as_dict() == {"circuit": "closed", "erori_consecutive": 0, "urmatoarea_incercare": None}
+
+
+async def test_retry_with_backoff(hass, aioclient_mock, monkeypatch):
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(feed_module.asyncio, "sleep", record_sleep)
+    monkeypatch.setattr(feed_module.random, "random", lambda: 0)
+    body = json.dumps(PAYLOAD).encode()
+    respond_in_turn(aioclient_mock, URL, (503, b"", None), (503, b"", None), (200, body, None), *[(503, b"", None)] * 3)
+    feed = ANMFeed(hass, URL)
+
+    await feed.async_refresh()
+    assert feed.last_update_success and feed.data == PAYLOAD
+    assert aioclient_mock.call_count == 3
+    assert delays == [1.0, 2.0]
+    assert feed.breaker.state == "closed"
+
+    # Toate încercările eșuează: o singură eroare pentru circuit, datele rămân.
+    await feed.async_refresh()
+    assert not feed.last_update_success and feed.data == PAYLOAD
+    assert feed.breaker.consecutive_failures == 1
+
+
+async def test_breaker_skips_requests_while_open(hass, aioclient_mock):
+    aioclient_mock.get(URL, status=503)
+    feed = ANMFeed(hass, URL, breaker=HostCircuitBreaker("anm.test"))
+    feed.breaker.consecutive_failures = BREAKER_FAILURE_THRESHOLD - 1
+    feed.breaker.record_failure()
+
+    await feed.async_refresh()
+    assert not feed.last_update_success
+    assert aioclient_mock.call_count == 0
+
+
+@pytest.mark.parametrize(("status", "body"), [(404, b"Not found"), (200, b"<html>eroare</html>")])
+async def test_host_errors_keep_circuit_closed(hass, aioclient_mock, status, body):
+    aioclient_mock.get(URL, status=status, content=body)
+    feed = ANMFeed(hass, URL)
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        await feed.async_refresh()
+    assert not feed.last_update_success
+    # Fără reîncercări: host-ul a răspuns.
+    assert aioclient_mock.call_count == BREAKER_FAILURE_THRESHOLD
+    assert feed.breaker.state == "closed" and feed.breaker.consecutive_failures == 0
+
+
+async def test_not_modified_and_unchanged(hass, aioclient_mock):
+    body = json.dumps(PAYLOAD).encode()
+    respond_in_turn(
+        aioclient_mock,
+        URL,
+        (200, body, {"ETag": '"v1"'}),
+        (304, b"", None),
+        (200, body, None),
+    )
+    feed = ANMFeed(hass, URL)
+
+    await feed.async_refresh()
+    data = feed.data
+    await feed.async_refresh()
+    assert aioclient_mock.mock_calls[-1][3] == {"If-None-Match": '"v1"'}
+    await feed.async_refresh()
+
+    assert feed.data is data
+    assert {key: feed.stats[key] for key in ("changed", "not_modified", "unchanged")} == {
+        "changed": 1,
+        "not_modified": 1,
+        "unchanged": 1,
+    }
+    assert feed.diagnostics()["unchanged_ratio"] == 0.667
+
+
+async def test_restore_from_cache(hass, hass_storage, aioclient_mock):
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"feeds": {URL: {"data": PAYLOAD, "etag": '"v1"', "salvat": "2026-07-14T10:00:00+00:00"}}},
+    }
+    aioclient_mock.get(URL, status=304)
+    feed = ANMFeed(hass, URL, cache=FeedCache(hass))
+
+    # Datele salvate sunt disponibile înainte de prima cerere.
+    assert await feed.async_ensure_data()
+    assert feed.data == PAYLOAD
+    await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 1
+    assert aioclient_mock.mock_calls[0][3] == {"If-None-Match": '"v1"'}
+    assert feed.stats["not_modified"] == 1
+
+
+@pytest.mark.parametrize(("size", "offloaded"), [(100, 0), (EXECUTOR_PARSE_THRESHOLD, 1)])
+async def test_executor_threshold(hass, aioclient_mock, size, offloaded):
+    body = json.dumps({"features": [], "padding": ""}).encode()
+    body = body.replace(b'""', b'"' + b"x" * max(size - len(body), 0) + b'"')
+    aioclient_mock.get(URL, content=body)
+    feed = ANMFeed(hass, URL)
+
+    await feed.async_refresh()
+    assert feed.last_update_success
+    assert feed.stats["executor_parses"] == offloaded
+
+
+async def test_large_xml_stream_offloaded(hass, aioclient_mock, recorded_xml):
+    aioclient_mock.get(XML_URL, content=recorded_xml)
+    feed = ANMFeed(hass, XML_URL, "xml")
+
+    await feed.async_refresh()
+    assert feed.data == prepare_avertizari_model(parse_avertizari_xml(recorded_xml))
+    assert feed.stats["executor_parses"] == 1
+    assert feed.stats["bytes"] == len(recorded_xml)
+
+
+async def test_quiet_interval(hass, aioclient_mock, freezer):
+    aioclient_mock.get(XML_URL, text=(
+        '<avertizari><avertizare tipMesaj="avertizare" dataAparitiei="2026-07-14T10:00"'
+        ' dataExpirarii="2026-07-15T08:00"><judet cod="CJ" culoare="1"/></avertizare></avertizari>'
+    ))
+    feed = ANMFeed(hass, XML_URL, "xml", alert_items=alert_items_xml)
+    base = timedelta(minutes=1)
+    feed.async_register_interval(base)
+
+    freezer.move_to("2026-07-14 12:00:00+00:00")
+    await feed.async_refresh()
+    assert base <= feed.update_interval < 2 * base
+
+    # Avertizarea a expirat, dar ANM o păstrează în feed: interogăm mai rar.
+    freezer.move_to("2026-07-15 12:00:00+00:00")
+    await feed.async_refresh()
+    assert feed.update_interval >= QUIET_INTERVAL_FACTOR * base
+    await feed.async_shutdown()
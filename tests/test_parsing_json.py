@@ -0,0 +1,243 @@
+"""Endpoint-urile JSON: avertizari-generale, nowcasting, starea-vremii, prognoza-orase."""
+from datetime import datetime
+
+import pytest
+
+from conftest import load_json
+from custom_components.meteo_anm.parsing import (
+    ANM_TIME_ZONE,
+    GridIndex,
+    LocalityPattern,
+    build_avertizari_generale,
+    build_avertizari_nowcasting,
+    city_coordinates,
+    distance_km,
+    index_avertizari_generale,
+    index_avertizari_nowcasting,
+    index_prognoza_orase,
+    index_starea_vremii,
+    locality_coordinates,
+    locality_slug,
+    parse_localitati,
+    zone_tokens,
+)
+
+
+def test_avertizari_generale():
+    data = index_avertizari_generale(load_json("avertizari-generale.json"))
+
+    result = build_avertizari_generale(data, "CJ")
+    assert result == {"avertizari": [{
+        "judet": "CJ",
+        "culoare": "1",
+        "use_coord_gis": "false",
+        "coord_gis": "",
+        "fenomene_vizate": "ger",
+        "data_expirarii": "2026-01-20T10:00",
+        "data_aparitiei": "2026-01-19T10:00",
+        "intervalul": "19 ianuarie, ora 20:00 – 20 ianuarie, ora 10:00",
+        "mesaj": "Transilvania și Moldova",
+        "tip_mesaj": "Atenționare meteorologică",
+        "culoare_generala": "1",
+    }]}
+    # `judet` ca obiect (nu listă) în a doua avertizare.
+    assert build_avertizari_generale(data, "BV")["avertizari"][0]["culoare"] == "2"
+    assert build_avertizari_generale(data, "B") == {}
+    assert build_avertizari_generale(data, "") == {}
+    assert build_avertizari_generale(index_avertizari_generale({}), "CJ") == {}
+
+
+def test_avertizari_generale_location():
+    data = load_json("avertizari-generale.json")
+    judet = data["avertizare"][0]["judet"][0]["@attributes"]
+    judet["useCoordGis"] = "true"
+    # Un pătrat în jurul municipiului Cluj-Napoca (EPSG:3857).
+    judet["coordGis"] = "MULTIPOLYGON (((2610000 5890000, 2640000 5890000, 2640000 5920000, 2610000 5920000, 2610000 5890000)))"
+    data = index_avertizari_generale(data)
+    # Conturul este parsat o singură dată, la indexare.
+    assert data[0].judete_index["CJ"][0].geometry is not None
+
+    assert build_avertizari_generale(data, "CJ", punct=(46.77, 23.60))["avertizari"][0]["locatie_afectata"] is True
+    assert build_avertizari_generale(data, "CJ", punct=(44.43, 26.10))["avertizari"][0]["locatie_afectata"] is False
+    # Fără geometrie, potrivirea rămâne doar după județ.
+    assert "locatie_afectata" not in build_avertizari_generale(data, "BV", punct=(44.43, 26.10))["avertizari"][0]
+
+
+def test_avertizari_generale_compact():
+    result = build_avertizari_generale(index_avertizari_generale(load_json("avertizari-generale.json")), "BV", compact=True)
+
+    assert "coord_gis" not in result["avertizari"][0]
+    assert result["avertizari"][0]["mesaj_hash"]
+
+
+@pytest.mark.parametrize("judet_long, zone", [
+    ("Cluj", ["Județul Cluj: Cluj-Napoca, Florești, Apahida; Județul Alba: Aiud",
+              "Județul Caraș-Severin: Reșița; Județul Cluj: Turda"]),
+    ("Satu Mare", ["Județul Satu Mare: Carei, Negrești-Oaș"]),
+    ("Caraș-Severin", ["Județul Caraș-Severin: Reșița; Județul Cluj: Turda"]),
+    ("Alba", ["Județul Cluj: Cluj-Napoca, Florești, Apahida; Județul Alba: Aiud"]),
+])
+def test_nowcasting_multiple_alerts(judet_long, zone):
+    index = index_avertizari_nowcasting(load_json("avertizari-nowcasting.json"))
+
+    result = build_avertizari_nowcasting(index, judet_long)
+    assert [a["zona"] for a in result["avertizari"]] == zone
+    assert result["avertizare_zona"] == result["avertizari"][0]
+
+
+def test_nowcasting_single_alert():
+    index = index_avertizari_nowcasting(load_json("avertizari-nowcasting-single.json"))
+
+    assert len(index) == 1
+    assert build_avertizari_nowcasting(index, "București")["avertizare_zona"]["culoare"] == "galben"
+    assert build_avertizari_nowcasting(index, "Ilfov") == {}
+
+
+def test_nowcasting_expiry():
+    index = index_avertizari_nowcasting(load_json("avertizari-nowcasting.json"))
+
+    before = build_avertizari_nowcasting(index, "Cluj", now=datetime(2026, 7, 14, 15, 0, tzinfo=ANM_TIME_ZONE))
+    assert [a["activa"] for a in before["avertizari"]] == [False, False]
+    assert before["_next_change"] == datetime(2026, 7, 14, 15, 10, tzinfo=ANM_TIME_ZONE)
+
+    later = build_avertizari_nowcasting(index, "Cluj", now=datetime(2026, 7, 14, 16, 30, tzinfo=ANM_TIME_ZONE))
+    assert [a["zona"] for a in later["avertizari"]] == ["Județul Caraș-Severin: Reșița; Județul Cluj: Turda"]
+    assert later["avertizari"][0]["activa"] is True
+
+    assert build_avertizari_nowcasting(index, "Cluj", now=datetime(2026, 7, 14, 18, 0, tzinfo=ANM_TIME_ZONE)) == {}
+
+
+def test_nowcasting_empty_payload():
+    assert len(index_avertizari_nowcasting("")) == 0
+    assert len(index_avertizari_nowcasting({"avertizare": None})) == 0
+
+
+def test_zone_tokens():
+    tokens = zone_tokens("Județul Satu Mare: Carei, Negrești-Oaș")
+
+    assert {"SATU MARE", "CAREI", "NEGRESTI OAS", "OAS"} <= tokens
+    assert "ALBA" not in tokens
+
+
+@pytest.mark.parametrize("zona", ["Județul Bistrița-Năsăud: Beclean", "Judetul Bistrita  Nasaud: Beclean"])
+def test_nowcasting_zone_spelling(zona):
+    index = index_avertizari_nowcasting({"avertizare": {"@attributes": {"zona": zona, "culoare": "galben"}}})
+
+    for judet_long in ("Bistrița-Năsăud", "BISTRITA NASAUD", "Bistrita - Nasaud"):
+        assert [a["zona"] for a in build_avertizari_nowcasting(index, judet_long)["avertizari"]] == [zona]
+
+
+@pytest.mark.parametrize("pattern, nume", [
+    ("Bucuresti", "BUCUREȘTI BĂNEASA"),
+    ("Bucuresti !Baneasa", "BUCUREȘTI FILARET"),
+    ("constanța", "CONSTANȚA"),
+    ("Constanta !dig", "CONSTANȚA"),
+    ("Constanta Dig", "CONSTANȚA DIG"),
+    ("Cluj", "CLUJ-NAPOCA"),
+])
+def test_starea_vremii(pattern, nume):
+    index = index_starea_vremii(load_json("starea-vremii.json"))
+
+    record = index.find(LocalityPattern(pattern))
+    assert record.nume == nume
+
+
+def test_starea_vremii_record():
+    index = index_starea_vremii(load_json("starea-vremii.json"))
+
+    assert len(index) == 5
+    assert index.find(LocalityPattern("Constanta Dig")).as_dict() == {
+        "nume": "CONSTANȚA DIG",
+        "temperatura": "25.8",
+        "umiditate": "70",
+        "presiune": "1010.3 mb",
+        "nebulozitate": "cer senin",
+        "fenomene": "",
+        "zapada": "",
+        "tempapa": "23",
+        "vant": "7 m/s, Nord-Est",
+        "last_update": "14-07-2026 ora 15:00",
+    }
+    assert index.find(LocalityPattern("Sulina")) is None
+    assert index.find(LocalityPattern("")) is None
+
+
+def test_prognoza_orase():
+    index = index_prognoza_orase(load_json("prognoza-orase.json"))
+
+    bucuresti = index.find(LocalityPattern("Bucuresti"))
+    assert [zi.data for zi in bucuresti.prognoza] == [
+        "2026-07-14", "2026-07-15", "2026-07-16", "2026-07-17", "2026-07-18",
+    ]
+    assert bucuresti.as_dict()["prognoza"][0]["temp_max"] == "34"
+    # `prognoza` ca obiect (o singură zi) și ca listă goală.
+    assert len(index.find(LocalityPattern("IASI")).prognoza) == 1
+    assert index.find(LocalityPattern("Constanța")).as_dict()["prognoza"] == []
+
+
+def test_parse_localitati():
+    assert parse_localitati("Bucuresti !Filaret,  Constanta   !dig, bucurești !filaret,") == [
+        "Bucuresti !Filaret",
+        "Constanta !dig",
+    ]
+    assert parse_localitati(["Iasi", "Iași"]) == ["Iasi"]
+    assert parse_localitati(None) == []
+    assert locality_slug("Constanța !Dig") == "constanta_not_dig"
+    # Excluderea și termenul obișnuit au unique_id-uri diferite.
+    assert parse_localitati("Bucuresti, Bucuresti !Filaret, Bucuresti Filaret, Bucuresti ! Filaret") == [
+        "Bucuresti",
+        "Bucuresti !Filaret",
+        "Bucuresti Filaret",
+    ]
+    assert locality_slug("Bucuresti Filaret") == "bucuresti_filaret"
+
+
+def test_starea_vremii_nearest():
+    index = index_starea_vremii(load_json("starea-vremii.json"))
+
+    # Otopeni: cea mai apropiată stație este Băneasa, nu Filaret.
+    record, distanta = index.nearest(44.55, 26.07)
+    assert record.nume == "BUCUREȘTI BĂNEASA"
+    assert 5 < distanta < 6
+    # Coordonatele EPSG:3857 sunt convertite; CONSTANȚA DIG nu are geometrie.
+    assert index.nearest(44.17, 28.66)[0].nume == "CONSTANȚA"
+    assert index.nearest(46.7, 23.5)[0].nume == "CLUJ-NAPOCA"
+    assert index_starea_vremii({"features": []}).nearest(44.4, 26.1) is None
+
+
+@pytest.mark.parametrize("lat, lon", [(32.87, -117.23), (-33.87, 151.21), (47.5, 19.04), (44.43, 32.0)])
+def test_nearest_outside_romania(lat, lon):
+    # San Diego, Sydney, Budapesta, Marea Neagră: nicio stație sau oraș apropiat.
+    assert index_starea_vremii(load_json("starea-vremii.json")).nearest(lat, lon) is None
+    assert index_prognoza_orase(load_json("prognoza-orase.json")).nearest(lat, lon) is None
+
+
+def test_prognoza_orase_nearest():
+    index = index_prognoza_orase(load_json("prognoza-orase.json"))
+
+    assert index.nearest(44.2, 28.5)[0].nume == "Constanța"
+    assert index.nearest(47.0, 27.5)[0].nume == "Iași"
+    assert city_coordinates("Cluj") == city_coordinates("cluj-napoca")
+    assert city_coordinates("Atlantida") is None
+
+
+def test_grid_index_matches_linear_scan():
+    points = [(43.6 + (i * 37 % 47) / 10, 20.3 + (i * 53 % 94) / 10, i) for i in range(300)]
+    grid = GridIndex(points)
+
+    for lat, lon in [(44.43, 26.1), (48.5, 19.0), (43.0, 30.5), (45.77, 24.12), (46.0, 29.95), (-33.87, 151.21)]:
+        expected = min(points, key=lambda p: distance_km(lat, lon, p[0], p[1]))
+        assert grid.nearest(lat, lon)[0] == expected[2]
+    assert grid.nearest(-33.87, 151.21, max_km=50) is None
+
+
+def test_locality_coordinates():
+    home = (44.43, 26.1)
+
+    assert locality_coordinates("@44.5 26.07") == (44.5, 26.07)
+    assert locality_coordinates("@ 44.5;26.07") == (44.5, 26.07)
+    assert locality_coordinates("@acasă", home) == home
+    assert locality_coordinates("@", home) == home
+    assert locality_coordinates("@home") is None
+    assert locality_coordinates("@95 26") is None
+    assert locality_coordinates("Bucuresti") is None
@@ -0,0 +1,271 @@
+"""Parserul avertizari-xml.php și construirea atributelor senzorilor XML/hartă."""
+from datetime import datetime, timezone
+import json
+
+import pytest
+
+from custom_components.meteo_anm.parsing import (
+    ANM_TIME_ZONE,
+    AvertizariXmlParser,
+    build_avertizari_harta,
+    build_avertizari_xml,
+    dump_avertizari_model,
+    get_message,
+    index_harta_svg,
+    avertizare_contains,
+    lat_lon_to_mercator,
+    load_avertizari_model,
+    load_harta_svg_index,
+    message_hash,
+    parse_avertizari_xml,
+    parse_wkt_polygons,
+)
+
+# 14 iulie 2026, ora 12:00 (ora României): prima avertizare din fixture este
+# emisă, dar începe la 14:00; a doua începe pe 15 iulie.
+BEFORE_START = datetime(2026, 7, 14, 12, 0, tzinfo=ANM_TIME_ZONE)
+DURING_FIRST = datetime(2026, 7, 14, 16, 0, tzinfo=ANM_TIME_ZONE)
+AFTER_FIRST = datetime(2026, 7, 15, 9, 0, tzinfo=ANM_TIME_ZONE)
+
+
+@pytest.fixture
+def zone_model(zone_xml):
+    return parse_avertizari_xml(zone_xml)
+
+
+def test_recorded_document_model(recorded_xml):
+    model = parse_avertizari_xml(recorded_xml)
+
+    assert [len(a.judete) for a in model] == [42, 7, 42]
+    assert all(not a.zone for a in model)
+    # Atributele voluminoase nu ajung în model ca text.
+    assert all(judet.coord_gis is None for a in model for judet in a.judete)
+    assert not hasattr(model[0], "__dict__")
+
+
+def test_model_is_immutable_and_hashable(recorded_xml):
+    model = parse_avertizari_xml(recorded_xml)
+    again = parse_avertizari_xml(recorded_xml)
+
+    # Înregistrările cu geometrie (coordGis) au hash, ca și celelalte.
+    assert any(judet.geometry is not None for judet in model[0].judete)
+    assert hash(model[0]) == hash(again[0]) and len(set(model + again)) == len(model)
+    with pytest.raises(AttributeError):
+        model[0].culoare = "3"
+    with pytest.raises(AttributeError):
+        model[0].judete[0].cod = "XX"
+
+
+@pytest.mark.parametrize("chunk_size", [61, 1024, 16 * 1024])
+def test_streaming_matches_one_shot(recorded_xml, chunk_size):
+    parser = AvertizariXmlParser()
+    for start in range(0, len(recorded_xml), chunk_size):
+        parser.feed(recorded_xml[start:start + chunk_size])
+
+    assert parser.close() == parse_avertizari_xml(recorded_xml)
+
+
+def test_invalid_document_raises():
+    with pytest.raises(Exception) as err:
+        parse_avertizari_xml(b"<avertizari><avertizare></avertizari>")
+    assert type(err.value).__name__ == "ParseError"
+
+
+def test_zone_index(zone_model):
+    first = zone_model[0]
+
+    assert [z.cod for z in first.zone_index["CJ"]] == ["CJ_1", "CJ_2", "CJ_3", "CJ_4"]
+    assert [z.as_dict() for z in first.zone_index["BV"]] == [
+        {"cod": "BV_1", "culoare": "1"},
+        {"cod": "BV_2", "culoare": "1"},
+    ]
+    assert list(first.judete_index) == ["CJ", "BV", "HR"]
+
+
+def test_validity_window(zone_model):
+    assert zone_model[0].inceput == datetime(2026, 7, 14, 14, 0, tzinfo=ANM_TIME_ZONE)
+    assert zone_model[0].sfarsit == datetime(2026, 7, 15, 8, 0, tzinfo=ANM_TIME_ZONE)
+    # Intervalul trece în anul următor apariției.
+    assert zone_model[2].inceput == datetime(2027, 1, 1, 10, 0, tzinfo=ANM_TIME_ZONE)
+
+
+def test_dump_load_round_trip(zone_model, recorded_xml):
+    for model in (zone_model, parse_avertizari_xml(recorded_xml)):
+        assert load_avertizari_model(json.loads(json.dumps(dump_avertizari_model(model)))) == model
+
+
+def test_build_filtered_by_judet(zone_model):
+    result = build_avertizari_xml(zone_model, "CJ")
+
+    assert "_state" in result
+    assert [a["meta"]["fenomene_vizate"] for a in result["avertizari"]] == [
+        "instabilitate atmosferică accentuată",
+        "caniculă",
+    ]
+    judet = result["avertizari"][0]["judete"][0]
+    assert judet["judet"] == "CJ"
+    assert judet["culoare"] == "2"
+    assert judet["mesaj"] == "COD PORTOCALIU ATENȚIONARE Averse torentială și grindină."
+    assert judet["zona_afectata"] == "zona montană a Carpaților Orientali"
+    assert [z["cod"] for z in judet["zone"]] == ["CJ_1", "CJ_2", "CJ_3", "CJ_4"]
+
+
+def test_build_skips_green_counties(zone_model):
+    assert build_avertizari_xml(zone_model, "HR") == {}
+    assert build_avertizari_xml(zone_model, "XX") == {}
+
+
+def test_build_all_counties(zone_model):
+    result = build_avertizari_xml(zone_model)
+
+    assert [[j["judet"] for j in a["judete"]] for a in result["avertizari"]] == [
+        ["CJ", "BV"],
+        ["AR", "TM", "CJ"],
+        ["SV", "BT"],
+    ]
+
+
+def test_build_compact(zone_model):
+    result = build_avertizari_xml(zone_model, "CJ", compact=True)
+    first = result["avertizari"][0]
+
+    assert "mesaj" not in first
+    assert get_message(first["mesaj_hash"]) == "COD PORTOCALIU ATENȚIONARE Averse torentială și grindină."
+    assert first["judete"] == [{"judet": "CJ", "culoare": "2", "zone": ["CJ_1", "CJ_2", "CJ_3", "CJ_4"]}]
+
+
+def test_published_message_survives_churn():
+    hot = message_hash("<p>Cod galben de vânt</p>")
+    for i in range(1000):
+        message_hash(f"Mesaj {i}")
+        # Senzorii republică hash-ul la fiecare actualizare.
+        assert message_hash("<p>Cod galben de vânt</p>") == hot
+
+    assert get_message(hot) == "Cod galben de vânt"
+    assert get_message(message_hash("Mesaj 0")) == "Mesaj 0"
+
+
+def test_build_expiry(zone_model):
+    before = build_avertizari_xml(zone_model, "CJ", now=BEFORE_START)
+    assert [a["meta"]["activa"] for a in before["avertizari"]] == [False, False]
+    assert before["_next_change"] == zone_model[0].inceput
+
+    during = build_avertizari_xml(zone_model, "CJ", now=DURING_FIRST)
+    assert [a["meta"]["activa"] for a in during["avertizari"]] == [True, False]
+    assert during["_next_change"] == zone_model[0].sfarsit
+
+    after = build_avertizari_xml(zone_model, "CJ", compact=True, now=AFTER_FIRST)
+    assert [a["data_expirarii"] for a in after["avertizari"]] == ["2026-07-16T20:00"]
+    assert after["_next_change"] == zone_model[1].inceput
+
+    assert build_avertizari_xml(zone_model, "CJ", now=datetime(2026, 8, 1, tzinfo=timezone.utc)) == {}
+
+
+def test_harta(zone_model):
+    result = build_avertizari_harta(zone_model)
+
+    assert len(result["maps"]) == 3
+    assert result["shapes"] == result["maps"][0]["shapes"]
+    assert result["maps"][0]["shapes"][:2] == [
+        {"id": "CJ", "color": "orange", "culoare": "2"},
+        {"id": "BV", "color": "yellow", "culoare": "1"},
+    ]
+    assert "HR" not in {s["id"] for s in result["maps"][0]["shapes"]}
+    assert result["maps"][2]["shapes"][0] == {"id": "SV", "color": "red", "culoare": "3"}
+
+
+def test_harta_compact_and_expiry(zone_model):
+    result = build_avertizari_harta(zone_model, compact=True, now=AFTER_FIRST)
+
+    assert "shapes" not in result
+    assert len(result["maps"]) == 2
+    assert "mesaj" not in result["maps"][0]["meta"]
+    assert result["maps"][0]["meta"]["activa"] is False
+
+
+HARTA_SVG = b"""<svg xmlns="http://www.w3.org/2000/svg">
+<g id="judete">
+<path id="judet_CJ" class="judet" d="M0 0"/>
+<path id="judet_BV" class="judet" data-judet="BV" d="M0 0"/>
+<path id="munte-CJ_1" class="munte" d="M0 0"/>
+<path id="munte-cj_4" class="munte" d="M0 0"/>
+<path id="SV" data-judet="SV" d="M0 0"/>
+<path id="legenda_CJ" d="M0 0"/>
+</g>
+</svg>"""
+
+
+def test_harta_svg_colors(zone_model):
+    svg_index = index_harta_svg(HARTA_SVG)
+
+    assert svg_index.ids("CJ") == ("judet_CJ",)
+    assert svg_index.ids("cj_1") == ("munte-CJ_1",)
+    result = build_avertizari_harta(zone_model, svg_index=svg_index)
+    assert result["maps"][0]["colors"] == {
+        "judet_CJ": "cod2",
+        "judet_BV": "cod1",
+        "munte-CJ_1": "cod2",
+        "munte-cj_4": "cod3",
+    }
+    assert result["maps"][2]["colors"] == {"SV": "cod3"}
+    # Același set de alerte reutilizează harta calculată.
+    again = build_avertizari_harta(zone_model, svg_index=svg_index)
+    assert again["maps"][0]["colors"] is result["maps"][0]["colors"]
+    assert "colors" not in build_avertizari_harta(zone_model)["maps"][0]
+
+
+def test_harta_svg_missing(tmp_path):
+    assert load_harta_svg_index(str(tmp_path / "anm-harta.svg")) is None
+
+
+BUCURESTI = (44.43, 26.10)
+MAREA_NEAGRA = (44.0, 30.5)
+
+
+def test_wkt_polygons():
+    geometry = parse_wkt_polygons(
+        "MULTIPOLYGON (((0 0, 10 0, 10 10, 0 10, 0 0), (4 4, 6 4, 6 6, 4 6, 4 4)), ((20 0, 30 0, 25 8, 20 0)))"
+    )
+
+    assert geometry.bbox == (0, 0, 30, 10)
+    assert geometry.contains(2, 2) and geometry.contains(25, 2)
+    assert not geometry.contains(5, 5)  # gaura
+    assert not geometry.contains(15, 5) and not geometry.contains(-1, 5)
+    assert parse_wkt_polygons("POLYGON ((0 0, 1 0, 1 1, 0 0))").contains(0.9, 0.5)
+    assert parse_wkt_polygons("") is None
+    assert parse_wkt_polygons("MULTIPOLYGON (((a b, c d)))") is None
+
+
+def test_location_in_recorded_geometry(recorded_xml):
+    model = parse_avertizari_xml(recorded_xml)
+
+    assert all(any(judet.geometry for judet in avertizare.judete) for avertizare in model)
+    x, y = lat_lon_to_mercator(*BUCURESTI)
+    # A doua avertizare vizează doar județe din nord/centru.
+    assert [avertizare_contains(avertizare, x, y) for avertizare in model] == [True, False, True]
+
+    # Senzorul filtrat pe CJ, cu locația în București.
+    result = build_avertizari_xml(model, "CJ", punct=BUCURESTI)
+    assert [a["meta"]["locatie_afectata"] for a in result["avertizari"]] == [True, False, True]
+    assert result["locatie_afectata"] is True
+    compact = build_avertizari_xml(model, "CJ", compact=True, punct=MAREA_NEAGRA)
+    assert [a["locatie_afectata"] for a in compact["avertizari"]] == [False, False, False]
+    assert compact["locatie_afectata"] is False
+    assert "locatie_afectata" not in build_avertizari_xml(model, "CJ")
+
+
+def test_location_prefers_zone_geometry():
+    judet = "POLYGON ((0 0, 100 0, 100 100, 0 100, 0 0))"
+    zona = "POLYGON ((0 0, 10 0, 10 10, 0 10, 0 0))"
+    model = parse_avertizari_xml(
+        '<avertizari><avertizare dataAparitiei="2026-07-14T10:00">'
+        f'<judet cod="CJ" culoare="2" useCoordGis="true" coordGis="{judet}"/>'
+        f'<zona cod="CJ_1" culoare="2" useCoordGis="true" coordGis="{zona}"/>'
+        f'<zona cod="CJ_2" culoare="0" useCoordGis="true" coordGis="{judet}"/>'
+        '</avertizare></avertizari>'.encode()
+    )
+
+    # Colțul județului din afara zonei montane colorate nu este afectat.
+    assert avertizare_contains(model[0], 5, 5) is True
+    assert avertizare_contains(model[0], 50, 50) is False
+    assert load_avertizari_model(dump_avertizari_model(model)) == model
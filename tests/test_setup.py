@@ -0,0 +1,134 @@
+"""Setup și reîncărcarea unei intrări în Home Assistant (payload-uri înregistrate)."""
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.const import EntityCategory  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse  # noqa: E402
+
+from conftest import RECORDED_XML, load_bytes  # noqa: E402
+from custom_components.meteo_anm import DOMAIN  # noqa: E402
+from custom_components.meteo_anm.diagnostics import async_get_config_entry_diagnostics  # noqa: E402
+from custom_components.meteo_anm.frontend import MAP_FILE, map_svg_path  # noqa: E402
+from custom_components.meteo_anm.sensor import SENSOR_DEFINITIONS, endpoint_url  # noqa: E402
+from custom_components.meteo_anm.static_config import DEFAULT_BASE_URL  # noqa: E402
+
+FIXTURES = {
+    "avertizari-generale": "avertizari-generale.json",
+    "avertizari-nowcasting": "avertizari-nowcasting.json",
+    "starea-vremii": "starea-vremii.json",
+    "prognoza-orase": "prognoza-orase.json",
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+def anm_api(aioclient_mock, monkeypatch):
+    """Răspunsurile ANM din fixture-uri; documentul XML este citit din stream."""
+    monkeypatch.setattr(AiohttpClientMockResponse, "content_length", None, raising=False)
+    with open(RECORDED_XML, "rb") as file:
+        xml = file.read()
+    for url in {endpoint_url(DEFAULT_BASE_URL, definition) for definition in SENSOR_DEFINITIONS}:
+        endpoint = url.rsplit("/", 1)[-1]
+        if endpoint in FIXTURES:
+            aioclient_mock.get(url, content=load_bytes(FIXTURES[endpoint]), headers={"content-type": "application/json"})
+        else:
+            aioclient_mock.get(url, content=xml, headers={"content-type": "application/xml"})
+    return aioclient_mock
+
+
+async def test_reload_keeps_diagnostic_entities(hass, anm_api):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={"update_interval": 180, "localitate": "Bucuresti", "judet": "B", "judet_long": "Bucuresti"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    url = endpoint_url(DEFAULT_BASE_URL, next(d for d in SENSOR_DEFINITIONS if d["endpoint"] == "starea-vremii"))
+    diagnostic = registry.async_get_entity_id("sensor", DOMAIN, f"diagnostic_{url}")
+    assert diagnostic is not None
+    registry.async_update_entity(diagnostic, name="Statie ANM")
+    removed = []
+    hass.bus.async_listen(
+        er.EVENT_ENTITY_REGISTRY_UPDATED,
+        lambda event: removed.append(event.data["entity_id"]) if event.data["action"] == "remove" else None,
+    )
+
+    # Opțiunile noi reîncarcă intrarea (o localitate în plus).
+    hass.config_entries.async_update_entry(entry, options={**entry.data, "localitate": "Bucuresti, Cluj"})
+    await hass.async_block_till_done()
+
+    assert removed == []
+    assert registry.async_get(diagnostic).name == "Statie ANM"
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_starea-vremii_cluj") is not None
+
+    # Scoaterea localității șterge doar entitățile ei.
+    hass.config_entries.async_update_entry(entry, options={**entry.data, "localitate": "Bucuresti"})
+    await hass.async_block_till_done()
+
+    assert len(removed) == 2 and all(entity_id.endswith("_cluj") for entity_id in removed)
+    assert registry.async_get(diagnostic).name == "Statie ANM"
+
+
+async def test_diagnostics_shared_between_entries(hass, anm_api):
+    entries = []
+    for judet, localitate in (("B", "Bucuresti"), ("CJ", "Cluj")):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            version=2,
+            data={"update_interval": 180, "localitate": localitate, "judet": judet, "judet_long": localitate},
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    urls = {endpoint_url(DEFAULT_BASE_URL, definition) for definition in SENSOR_DEFINITIONS}
+    diagnostics = [entry for entry in registry.entities.values() if entry.entity_category == EntityCategory.DIAGNOSTIC]
+    # Un senzor per URL (harta folosește documentul XML) și o singură ultimă verificare.
+    assert sorted(entry.unique_id for entry in diagnostics) == sorted(
+        ["ultima_verificare", *(f"diagnostic_{url}" for url in urls)]
+    )
+    assert not any(entry.entity_id.endswith("_2") for entry in diagnostics)
+    assert hass.states.get("sensor.ultima_verificare_anm").state != "unavailable"
+
+    # La descărcarea primei intrări, senzorii trec la a doua.
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+    for entry in diagnostics:
+        assert registry.async_get(entry.entity_id).config_entry_id == entries[1].entry_id
+        assert hass.states.get(entry.entity_id).state != "unavailable"
+    dump = await async_get_config_entry_diagnostics(hass, entries[1])
+    assert set(dump["endpoints"]) == {"avertizari-generale", "avertizari-xml.php", "avertizari-nowcasting", "starea-vremii", "prognoza-orase"}
+    assert dump["endpoints"]["avertizari-xml.php"]["state_writes_entitati"]
+
+
+async def test_map_falls_back_to_www(hass, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    assert await hass.async_add_executor_job(map_svg_path, hass) is None
+
+    www = tmp_path / "www"
+    www.mkdir()
+    (www / MAP_FILE).write_text("<svg/>")
+    assert await hass.async_add_executor_job(map_svg_path, hass) == str(www / MAP_FILE)
+
+
+@pytest.mark.parametrize("advanced", [False, True])
+async def test_base_url_only_in_advanced_mode(hass, advanced):
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user", "show_advanced_options": advanced}
+    )
+
+    assert ("base_url" in result["data_schema"].schema) is advanced